@@ -0,0 +1,241 @@
+"""Local stand-in for the fr-en-calendrier-scolaire dataset of data.education.gouv.fr.
+
+Rejoue un enregistrement de l'export (fixtures/*.jsonl, voir record_fixture.py)
+ou, à défaut, un jeu de données synthétique de même forme.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+import hashlib
+import json
+from pathlib import Path
+import random
+import re
+from typing import Any
+
+from aiohttp import web
+
+DATASET_PATH = "/api/explore/v2.1/catalog/datasets/fr-en-calendrier-scolaire"
+FIXTURE = Path(__file__).parent / "fixtures" / "fr-en-calendrier-scolaire.jsonl"
+
+ACADEMIES = {
+    "Zone A": ["Besançon", "Bordeaux", "Clermont-Ferrand", "Dijon", "Grenoble", "Limoges", "Lyon", "Poitiers"],
+    "Zone B": [
+        "Aix-Marseille", "Amiens", "Lille", "Nancy-Metz", "Nantes", "Nice",
+        "Normandie", "Orléans-Tours", "Reims", "Rennes", "Strasbourg",
+    ],
+    "Zone C": ["Créteil", "Montpellier", "Paris", "Toulouse", "Versailles"],
+    "Corse": ["Corse"],
+    "Guadeloupe": ["Guadeloupe"],
+    "Réunion": ["Réunion"],
+}
+
+# Périodes synthétiques : (description, mois, jour, durée en jours)
+PERIODS = [
+    ("Vacances de la Toussaint", 10, 19, 16),
+    ("Vacances de Noël", 12, 21, 16),
+    ("Vacances d'Hiver", 2, 8, 16),
+    ("Vacances de Printemps", 4, 5, 16),
+    ("Pont de l'Ascension", 5, 29, 4),
+    ("Vacances d'Été", 7, 5, 58),
+]
+
+
+def _utc(day: date) -> str:
+    """Return local midnight in Paris as the API's UTC timestamp."""
+    offset = 1 if day.month in (11, 12, 1, 2, 3) else 2
+    moment = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) - timedelta(hours=offset)
+    return moment.isoformat()
+
+
+def synthetic_rows(years: int = 8, scale: int = 1) -> list[dict[str, Any]]:
+    """Build a synthetic dataset with the same columns as the real export."""
+    # Années passées et l'année scolaire suivante, comme le jeu publié
+    first_year = date.today().year - years + 2
+    rows = []
+    for copy in range(scale):
+        suffix = f" {copy}" if copy else ""
+        for zone, academies in ACADEMIES.items():
+            shift = list(ACADEMIES).index(zone) * 7
+            for academy in academies:
+                for year in range(first_year, first_year + years):
+                    annee = f"{year}-{year + 1}"
+                    for description, month, day, length in PERIODS:
+                        start = date(year if month >= 8 else year + 1, month, day)
+                        if description in ("Vacances d'Hiver", "Vacances de Printemps"):
+                            start += timedelta(days=shift)
+                        for population in ("-",) if length < 10 else ("Élèves", "Enseignants"):
+                            end = start + timedelta(days=length + (1 if population == "Enseignants" else 0))
+                            rows.append(
+                                {
+                                    "description": description,
+                                    "population": population,
+                                    "start_date": _utc(start),
+                                    "end_date": _utc(end),
+                                    "location": academy + suffix,
+                                    "zones": zone,
+                                    "annee_scolaire": annee,
+                                }
+                            )
+    return rows
+
+
+def load_rows(scale: int = 1) -> list[dict[str, Any]]:
+    """Return the recorded rows if a fixture exists, else the synthetic ones."""
+    if FIXTURE.exists():
+        with FIXTURE.open(encoding="utf-8") as fixture:
+            rows = [json.loads(line) for line in fixture if line.strip()]
+        if scale > 1:
+            rows += [
+                {**row, "location": f"{row['location']} {copy}"}
+                for copy in range(1, scale)
+                for row in rows
+            ]
+        return rows
+    return synthetic_rows(scale=scale)
+
+
+_IN_CLAUSE = re.compile(r'(zones|location) IN \(([^)]*)\)')
+_CUTOFF = re.compile(r"end_date>=date'(\d{4}-\d{2}-\d{2})'")
+
+
+def _filter(rows: list[dict[str, Any]], where: str) -> list[dict[str, Any]]:
+    """Apply the subset of ODSQL used by the integration."""
+    wanted: dict[str, set[str]] = {}
+    for field, values in _IN_CLAUSE.findall(where):
+        wanted.setdefault(field, set()).update(json.loads(f"[{values}]"))
+    cutoff = _CUTOFF.search(where)
+    result = []
+    for row in rows:
+        if cutoff and row["end_date"][:10] < cutoff.group(1):
+            continue
+        if wanted and not any(row.get(field) in values for field, values in wanted.items()):
+            continue
+        result.append(row)
+    return result
+
+
+class FakeCalendarServer:
+    """aiohttp server replaying the dataset with configurable latency and errors."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        scale: int = 1,
+        chunk_size: int = 16 * 1024,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server."""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_size = chunk_size
+        self.rows = load_rows(scale)
+        self.modified = "2025-01-01T00:00:00+00:00"
+        self.requests: dict[str, int] = {}
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    def publish_update(self) -> None:
+        """Publish a new version of the dataset: one period moves by a day."""
+        # Dernière période publiée, conservée quelle que soit la date de coupure
+        row = max(self.rows, key=lambda r: r["end_date"])
+        end = datetime.fromisoformat(row["end_date"]) + timedelta(days=1)
+        row["end_date"] = end.isoformat()
+        modified = datetime.fromisoformat(self.modified) + timedelta(seconds=1)
+        self.modified = modified.isoformat()
+
+    def _etag(self) -> str:
+        return '"' + hashlib.sha1(self.modified.encode()).hexdigest() + '"'
+
+    async def _prelude(self, request: web.Request, name: str) -> web.Response | None:
+        """Count the request, apply latency and injected errors."""
+        self.requests[name] = self.requests.get(name, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.Response(status=self.error_status, headers={"Retry-After": "1"})
+        return None
+
+    async def _metadata(self, request: web.Request) -> web.Response:
+        if (error := await self._prelude(request, "metadata")) is not None:
+            return error
+        if request.headers.get("If-None-Match") == self._etag():
+            return web.Response(status=304)
+        body = json.dumps({"dataset_id": "fr-en-calendrier-scolaire", "metas": {"default": {"data_processed": self.modified}}})
+        self.bytes_sent += len(body)
+        return web.Response(text=body, content_type="application/json", headers={"ETag": self._etag()})
+
+    async def _records(self, request: web.Request) -> web.Response:
+        if (error := await self._prelude(request, "records")) is not None:
+            return error
+        rows = _filter(self.rows, request.query.get("where", ""))
+        rows.sort(key=lambda row: row["start_date"])
+        offset = int(request.query.get("offset", 0))
+        limit = min(int(request.query.get("limit", 10)), 100)
+        body = json.dumps({"total_count": len(rows), "results": rows[offset:offset + limit]})
+        self.bytes_sent += len(body)
+        return web.Response(text=body, content_type="application/json")
+
+    async def _export(self, request: web.Request) -> web.StreamResponse:
+        if (error := await self._prelude(request, "export")) is not None:
+            return error
+        response = web.StreamResponse(headers={"Content-Type": "application/jsonl"})
+        await response.prepare(request)
+        buffer = bytearray()
+        for row in self.rows:
+            buffer += json.dumps(row, ensure_ascii=False).encode() + b"\n"
+            if len(buffer) >= self.chunk_size:
+                await response.write(bytes(buffer))
+                self.bytes_sent += len(buffer)
+                buffer.clear()
+        if buffer:
+            await response.write(bytes(buffer))
+            self.bytes_sent += len(buffer)
+        await response.write_eof()
+        return response
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start the server and return the dataset base URL."""
+        app = web.Application()
+        app.router.add_get(DATASET_PATH, self._metadata)
+        app.router.add_get(f"{DATASET_PATH}/records", self._records)
+        app.router.add_get(f"{DATASET_PATH}/exports/jsonl", self._export)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = self._runner.addresses[0]
+        self.base_url = f"http://{bound[0]}:{bound[1]}{DATASET_PATH}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args: Any) -> None:
+    server = FakeCalendarServer(
+        latency=args.latency, error_rate=args.error_rate, error_status=args.error_status, scale=args.scale
+    )
+    print(await server.start(port=args.port))
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="délai par requête (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="proportion de réponses en erreur")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--scale", type=int, default=1, help="multiplie le nombre d'académies")
+    asyncio.run(_serve(parser.parse_args()))
@@ -0,0 +1,142 @@
+"""Load test: hundreds of config entries on one Home Assistant instance.
+
+Usage : python benchmarks/load_test.py [--entries 500] [--no-scale-mode] [--output load.json]
+
+Mesure, contre le faux serveur local, le coût par entrée (mémoire, temps de
+setup, minuteurs de la boucle) et la latence de la boucle d'événements pendant
+un rafraîchissement synchronisé de toutes les entrées.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from run import ROOT, scale_for, setup_entries, summarize  # noqa: F401 - ROOT règle sys.path
+
+from homeassistant import loader
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+from custom_components.vacances_scolaires import coordinator as coordinator_module
+from custom_components.vacances_scolaires.const import DATA_STORE, DATA_TIMERS, DOMAIN
+
+from fake_server import FakeCalendarServer
+
+# Période d'échantillonnage de la latence de boucle (secondes)
+LAG_SAMPLE_INTERVAL = 0.005
+
+
+def loop_timers(hass: HomeAssistant) -> int:
+    """Return the number of pending timers of the event loop."""
+    return sum(1 for handle in hass.loop._scheduled if not handle.cancelled())
+
+
+async def sample_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Record how late the loop wakes up a task sleeping LAG_SAMPLE_INTERVAL."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_SAMPLE_INTERVAL
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def synchronized_refresh(hass: HomeAssistant, server: FakeCalendarServer) -> dict[str, Any]:
+    """Refresh every entry at once with a changed dataset, measuring loop lag."""
+    store = hass.data[DATA_STORE]
+    coordinators = list(hass.data[DOMAIN].values())
+    # Nouvelle version publiée et cache expiré : les index sont reconstruits et chaque entrée notifiée
+    server.publish_update()
+    store.fetched_at = None
+
+    samples: list[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_lag(samples, stop))
+    start = time.perf_counter()
+    if coordinators[0].scale_mode:
+        # Minuteur commun du calendrier partagé
+        await store._async_poll_refresh()
+    else:
+        # Minuteurs par entrée arrivant à échéance ensemble
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+    # Les entrées publient leur nouvel instantané depuis des tâches d'arrière-plan
+    await hass.async_block_till_done(wait_background_tasks=True)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+    return {
+        "duration_s": elapsed,
+        "loop_lag": summarize(samples or [0.0]),
+        "entries_updated": sum(1 for coordinator in coordinators if coordinator.last_update_success),
+    }
+
+
+async def load_test(args: argparse.Namespace) -> dict[str, Any]:
+    """Set up args.entries entries and measure their footprint."""
+    if args.no_scale_mode:
+        coordinator_module.SCALE_MODE_MIN_ENTRIES = args.entries + 1
+    server = FakeCalendarServer(latency=args.latency, scale=scale_for(args.entries, 1))
+    base_url = await server.start()
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            async with async_test_home_assistant(config_dir=config_dir) as hass:
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                timers_before = loop_timers(hass)
+                tracemalloc.start()
+                baseline, _ = tracemalloc.get_traced_memory()
+                start = time.perf_counter()
+                entries = await setup_entries(hass, base_url, args.entries)
+                setup_s = time.perf_counter() - start
+                await hass.async_block_till_done(wait_background_tasks=True)
+                until_data_s = time.perf_counter() - start
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                timers_after = loop_timers(hass)
+                shared_timers = hass.data.get(DATA_TIMERS)
+                entities = len(hass.states.async_all())
+
+                refresh = await synchronized_refresh(hass, server)
+                upstream_requests = server.requests
+
+                for entry in entries:
+                    await hass.config_entries.async_unload(entry.entry_id)
+                await hass.async_stop(force=True)
+    finally:
+        await server.stop()
+    return {
+        "python": platform.python_version(),
+        "entries": args.entries,
+        "scale_mode": not args.no_scale_mode,
+        "entities": entities,
+        "setup_s": setup_s,
+        "setup_per_entry_ms": setup_s / args.entries * 1000,
+        "until_data_s": until_data_s,
+        "memory_per_entry_kib": (current - baseline) / args.entries / 1024,
+        "peak_memory_kib": peak / 1024,
+        "loop_timers": timers_after - timers_before,
+        "shared_boundary_callbacks": len(shared_timers) if shared_timers is not None else 0,
+        "synchronized_refresh": refresh,
+        "upstream_requests": upstream_requests,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="fichier JSON de sortie (stdout par défaut)")
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0, help="latence simulée par requête (s)")
+    parser.add_argument(
+        "--no-scale-mode", action="store_true", help="un minuteur de rafraîchissement par entrée, pour comparer"
+    )
+    arguments = parser.parse_args()
+    output = json.dumps(asyncio.run(load_test(arguments)), indent=2, ensure_ascii=False)
+    if arguments.output:
+        arguments.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
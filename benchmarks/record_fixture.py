@@ -0,0 +1,31 @@
+"""Record the real dataset export into fixtures/ for the fake server to replay."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.vacances_scolaires.const import API_BASE_URL
+from custom_components.vacances_scolaires.store import EXPORT_FIELDS
+
+from fake_server import FIXTURE
+
+
+async def main() -> None:
+    """Download exports/jsonl and write it next to the benchmarks."""
+    FIXTURE.parent.mkdir(exist_ok=True)
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{API_BASE_URL}/exports/jsonl", params={"select": EXPORT_FIELDS}) as response:
+            response.raise_for_status()
+            with FIXTURE.open("wb") as fixture:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    fixture.write(chunk)
+    print(f"{FIXTURE} ({FIXTURE.stat().st_size} octets)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
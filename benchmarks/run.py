@@ -0,0 +1,268 @@
+"""Offline benchmarks of the Vacances Scolaires refresh path.
+
+Usage : python benchmarks/run.py [--output bench.json] [--latency 0.05] ...
+
+Les résultats sont écrits en JSON (une clé par mesure) pour être comparés
+d'une version à l'autre.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant import loader
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_get_setup_timings
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.vacances_scolaires.api import VacancesScolairesApiClient
+from custom_components.vacances_scolaires.const import (
+    CONF_CONFIG_TYPE,
+    CONF_CREATE_CALENDAR,
+    CONF_LOCATION,
+    CONF_UPDATE_INTERVAL,
+    CONF_ZONE,
+    DATA_CLIENT,
+    DATA_STORE,
+    DOMAIN,
+)
+
+from fake_server import ACADEMIES, FakeCalendarServer
+
+ENTRY_COUNTS = (1, 10, 100)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return latency percentiles in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+LOCATIONS = [academy for academies in ACADEMIES.values() for academy in academies]
+
+
+def entry_data(i: int) -> tuple[str, dict[str, Any]]:
+    """Return the title and data of the i-th benchmark entry (zones then locations)."""
+    zones = list(ACADEMIES)
+    if i < len(zones):
+        zone = zones[i]
+        return zone, {CONF_CONFIG_TYPE: "zone", CONF_ZONE: zone, CONF_UPDATE_INTERVAL: 12, CONF_CREATE_CALENDAR: True}
+    copy, position = divmod(i - len(zones), len(LOCATIONS))
+    # Au-delà des académies réelles, on vise leurs copies (« Lyon 1 »…) générées par le serveur
+    location = f"{LOCATIONS[position]} {copy}" if copy else LOCATIONS[position]
+    return location, {
+        CONF_CONFIG_TYPE: "location",
+        CONF_LOCATION: location,
+        CONF_UPDATE_INTERVAL: 12,
+        CONF_CREATE_CALENDAR: True,
+    }
+
+
+def scale_for(count: int, scale: int) -> int:
+    """Return the dataset scale needed so every entry has its own location."""
+    return max(scale, (count - len(ACADEMIES)) // len(LOCATIONS) + 1)
+
+
+async def setup_entries(hass: HomeAssistant, base_url: str, count: int) -> list[MockConfigEntry]:
+    """Create and set up `count` config entries against the fake server."""
+    hass.data[DATA_CLIENT] = VacancesScolairesApiClient(hass, base_url=base_url)
+    entries = []
+    for i in range(count):
+        title, data = entry_data(i)
+        entry = MockConfigEntry(domain=DOMAIN, title=f"Vacances Scolaires ({title})", data=data)
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    for entry in entries:
+        await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entries
+
+
+async def timed(action: Callable[[], Awaitable[Any]]) -> float:
+    """Return the wall time of one awaited call."""
+    start = time.perf_counter()
+    await action()
+    return time.perf_counter() - start
+
+
+async def bench_setup(args: argparse.Namespace, count: int) -> dict[str, Any]:
+    """Measure cold setup time and peak memory for `count` entries."""
+    server = FakeCalendarServer(latency=args.latency, scale=scale_for(count, args.scale))
+    base_url = await server.start()
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            async with async_test_home_assistant(config_dir=config_dir) as hass:
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                tracemalloc.start()
+                start = time.perf_counter()
+                entries = await setup_entries(hass, base_url, count)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                # Part de l'intégration dans le démarrage, telle que HA la mesure
+                setup_timing = async_get_setup_timings(hass).get(DOMAIN)
+                # Premier téléchargement, désormais hors du démarrage
+                await hass.async_block_till_done(wait_background_tasks=True)
+                background_s = time.perf_counter() - start
+                for entry in entries:
+                    await hass.config_entries.async_unload(entry.entry_id)
+                await hass.async_stop(force=True)
+    finally:
+        await server.stop()
+    return {
+        "entries": count,
+        "setup_s": elapsed,
+        "ha_setup_timing_s": setup_timing,
+        "until_data_s": background_s,
+        "peak_memory_kib": peak / 1024,
+        "upstream_requests": server.requests,
+        "bytes_sent": server.bytes_sent,
+    }
+
+
+async def bench_refresh(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure _async_update_data and per-entity property costs."""
+    server = FakeCalendarServer(latency=args.latency, error_rate=args.error_rate, scale=args.scale)
+    base_url = await server.start()
+    results: dict[str, Any] = {}
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            async with async_test_home_assistant(config_dir=config_dir) as hass:
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                entries = await setup_entries(hass, base_url, 1)
+                coordinator = hass.data[DOMAIN][entries[0].entry_id]
+                store = hass.data[DATA_STORE]
+
+                async def cold_update() -> None:
+                    # Cache expiré et jeu de données réellement modifié : fusion, index et instantané complets
+                    server.publish_update()
+                    store.fetched_at = None
+                    await coordinator._async_update_data()
+
+                async def warm_update() -> None:
+                    # Cache expiré mais jeu de données inchangé : revalidation par les métadonnées, sans téléchargement
+                    store.fetched_at = dt_util.utcnow() - coordinator.refresh_interval
+                    await coordinator._async_update_data()
+
+                samples, failures = [], 0
+                tracemalloc.start()
+                for _ in range(args.iterations):
+                    try:
+                        samples.append(await timed(cold_update))
+                    except Exception:  # noqa: BLE001 - erreurs injectées comptées à part
+                        failures += 1
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results["update_full"] = {**summarize(samples or [0.0]), "failures": failures, "peak_memory_kib": peak / 1024}
+
+                # Écritures d'état provoquées par des rafraîchissements sans changement
+                state_writes = 0
+
+                @callback
+                def count_writes(event: Event) -> None:
+                    nonlocal state_writes
+                    if event.data["entity_id"] in own_entities:
+                        state_writes += 1
+
+                own_entities = {
+                    entity.entity_id
+                    for platform_name in ("sensor", "calendar")
+                    for entity in hass.data["entity_components"][platform_name].entities
+                    if entity.platform.platform_name == DOMAIN
+                }
+                await coordinator.async_refresh()
+                await hass.async_block_till_done()
+                unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, count_writes)
+                samples, failures = [], 0
+                for _ in range(args.iterations):
+                    try:
+                        samples.append(await timed(warm_update))
+                        coordinator.async_set_updated_data(coordinator.data)
+                    except Exception:  # noqa: BLE001 - erreurs injectées comptées à part
+                        failures += 1
+                await hass.async_block_till_done()
+                unsubscribe()
+                results["update_not_modified"] = {
+                    **summarize(samples or [0.0]),
+                    "failures": failures,
+                    "state_changed_events": state_writes,
+                    "entities": len(own_entities),
+                }
+
+                results["entities"] = bench_entities(hass, args.iterations * 100)
+                await hass.config_entries.async_unload(entries[0].entry_id)
+                await hass.async_stop(force=True)
+    finally:
+        await server.stop()
+    results["upstream_requests"] = server.requests
+    return results
+
+
+def bench_entities(hass: HomeAssistant, loops: int) -> dict[str, Any]:
+    """Time the state properties of every entity of the integration."""
+    timings: dict[str, Any] = {}
+    for platform_name in ("sensor", "calendar"):
+        for entity in hass.data["entity_components"][platform_name].entities:
+            if entity.platform.platform_name != DOMAIN:
+                continue
+            for prop in ("native_value", "extra_state_attributes", "event"):
+                if not hasattr(type(entity), prop):
+                    continue
+                start = time.perf_counter()
+                for _ in range(loops):
+                    getattr(entity, prop)
+                per_call_us = (time.perf_counter() - start) / loops * 1e6
+                timings[f"{type(entity).__name__}.{prop}_us"] = per_call_us
+    return timings
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark and return the report."""
+    report: dict[str, Any] = {
+        "python": platform.python_version(),
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+        "refresh": await bench_refresh(args),
+        "setup": [await bench_setup(args, count) for count in args.entries],
+    }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="fichier JSON de sortie (stdout par défaut)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="latence simulée par requête (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="proportion de réponses 503")
+    parser.add_argument("--scale", type=int, default=1, help="multiplie la taille du jeu de données")
+    parser.add_argument("--entries", type=int, nargs="+", default=list(ENTRY_COUNTS))
+    arguments = parser.parse_args()
+    output = json.dumps(asyncio.run(main(arguments)), indent=2, ensure_ascii=False)
+    if arguments.output:
+        arguments.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
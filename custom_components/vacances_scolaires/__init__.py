@@ -1,35 +1,107 @@
+import asyncio
+import random
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from .const import DOMAIN, PLATFORMS, CONF_CREATE_CALENDAR
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from .const import (
+    DOMAIN,
+    PLATFORMS,
+    CONF_CREATE_CALENDAR,
+    DATA_CLIENT,
+    DATA_STORE,
+    FIRST_REFRESH_RETRY,
+    STARTUP_JITTER,
+)
 from .coordinator import VacancesScolairesDataUpdateCoordinator
+from .ics import async_register_ics_view
+from .services import async_setup_services
+from .store import async_get_store
+from .timers import async_release_shared_timers
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    return True
+
+async def _async_revalidate(coordinator: VacancesScolairesDataUpdateCoordinator) -> None:
+    """Refresh a cached entry after a random delay, so entries don't all hit the API at boot."""
+    await asyncio.sleep(random.uniform(0, STARTUP_JITTER))
+    await coordinator.async_refresh()
+
+async def _async_first_refresh(coordinator: VacancesScolairesDataUpdateCoordinator) -> None:
+    """Fetch an entry without cache in the background, retrying sooner than the update interval."""
+    delay = FIRST_REFRESH_RETRY
+    while True:
+        await coordinator.async_refresh()
+        if coordinator.data is not None:
+            return
+        # Remplace le ConfigEntryNotReady : les entités existent déjà, seules les données manquent
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, coordinator.refresh_interval.total_seconds())
+
+def _platforms(entry: ConfigEntry) -> list[str]:
+    """Return the platforms of an entry."""
+    if entry.data.get(CONF_CREATE_CALENDAR):
+        return [*PLATFORMS, "calendar"]
+    return PLATFORMS
+
+async def _async_release_when_idle(hass: HomeAssistant) -> None:
+    """Release the shared store and client once the running download is over."""
+    store = hass.data.get(DATA_STORE)
+    if store is not None:
+        await store.async_wait_idle()
+        # Cache disque écrit avant la vérification : un calendrier recréé ensuite le relit à jour
+        await store.async_flush()
+    if hass.data.get(DOMAIN):
+        # Entrée chargée pendant l'attente (rechargement des options) : elle garde calendrier et client
+        return
+    async_release_shared_timers(hass)
+    # Retirés ensemble, sans attente entre les deux : une entrée chargée pendant la fermeture en recrée
+    hass.data.pop(DATA_STORE, None)
+    client = hass.data.pop(DATA_CLIENT, None)
+    if client is not None:
+        await client.async_close()
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Vacances Scolaires from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = VacancesScolairesDataUpdateCoordinator(hass, entry)
-
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except ConfigEntryNotReady:
-        raise ConfigEntryNotReady("Failed to fetch initial data from Vacances Scolaires API")
+    store = async_get_store(hass)
+    await store.async_load()
 
+    coordinator = VacancesScolairesDataUpdateCoordinator(hass, entry, store)
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Use async_forward_entry_setups instead of async_forward_entry_setup
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Aucun appel réseau avant la création des entités : le démarrage de HA n'attend pas l'API
+    if await coordinator.async_restore_from_cache():
+        # Données servies depuis le cache disque, revalidation en arrière-plan si expiré
+        if not store.is_fresh():
+            entry.async_create_background_task(
+                hass, _async_revalidate(coordinator), f"{DOMAIN}_revalidate_{entry.entry_id}"
+            )
+    else:
+        entry.async_create_background_task(
+            hass, _async_first_refresh(coordinator), f"{DOMAIN}_first_refresh_{entry.entry_id}"
+        )
 
-    if entry.data.get(CONF_CREATE_CALENDAR):
-        await hass.config_entries.async_forward_entry_setups(entry, ["calendar"])
+    async_register_ics_view(hass)
+
+    await hass.config_entries.async_forward_entry_setups(entry, _platforms(entry))
 
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    platforms = PLATFORMS.copy()
-    if entry.data.get(CONF_CREATE_CALENDAR):
-        platforms.append("calendar")
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, _platforms(entry))
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        # Désinscription immédiate : les rappels async_on_unload ne passent qu'après ce retour
+        if (store := hass.data.get(DATA_STORE)) is not None:
+            store.async_unregister(entry.entry_id)
+        # Dernière entrée déchargée : on libère le calendrier et le client partagés
+        if not hass.data[DOMAIN]:
+            hass.async_create_background_task(_async_release_when_idle(hass), f"{DOMAIN}_release")
     return unload_ok
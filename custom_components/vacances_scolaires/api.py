@@ -0,0 +1,297 @@
+"""Shared HTTP client for the Vacances Scolaires integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import time
+from typing import Any
+from urllib.parse import urlencode
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import API_BASE_URL, API_TIMEOUT, DATA_CLIENT
+from .metrics import RefreshMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Taille des blocs lus lors d'un export en flux (octets)
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Au-delà de cette taille, le décodage JSON quitte la boucle d'événements (octets)
+JSON_EXECUTOR_THRESHOLD = 64 * 1024
+
+# Ordonnancement partagé des requêtes
+MAX_CONCURRENT_REQUESTS = 2
+MIN_REQUEST_INTERVAL = 1.0  # secondes entre deux débuts de requête
+MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 2.0  # secondes, doublé à chaque tentative
+MAX_RETRY_AFTER = 60  # au-delà, pas de nouvelle tentative immédiate
+BREAKER_THRESHOLD = 3  # échecs consécutifs (après nouvelles tentatives)
+BREAKER_COOLDOWN = 300  # secondes
+BREAKER_MAX_COOLDOWN = 3600
+
+
+class VacancesScolairesApiError(Exception):
+    """Error returned by the data.education.gouv.fr API."""
+
+
+class CircuitOpenError(VacancesScolairesApiError):
+    """Raised without calling the API while the circuit breaker is open."""
+
+
+class RetryableStatusError(VacancesScolairesApiError):
+    """429 or 5xx answer that is worth retrying."""
+
+    def __init__(self, status: int, retry_after: float | None) -> None:
+        """Initialize the error."""
+        super().__init__(f"Error communicating with API: {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+# Erreurs d'un appel à l'API, pour les appelants qui retombent sur le cache
+REQUEST_ERRORS = (VacancesScolairesApiError, aiohttp.ClientError, TimeoutError)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the Retry-After delay in seconds (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (moment - dt_util.utcnow()).total_seconds())
+
+
+class VacancesScolairesApiClient:
+    """HTTP client shared by every config entry of a hass instance.
+
+    Toutes les requêtes passent par le même ordonnanceur : concurrence et débit
+    plafonnés, nouvelles tentatives avec backoff exponentiel et gigue (en
+    respectant Retry-After), et disjoncteur qui coupe les appels après des
+    échecs répétés.
+    """
+
+    def __init__(self, hass: HomeAssistant, base_url: str = API_BASE_URL) -> None:
+        """Initialize the client."""
+        self.hass = hass
+        self.base_url = base_url
+        self._sessions: dict[bool, aiohttp.ClientSession] = {}
+        # Validateurs HTTP (ETag, Last-Modified) par requête
+        self._validators: dict[str, tuple[str | None, str | None]] = {}
+        self.metrics = RefreshMetrics()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._rate_lock = asyncio.Lock()
+        self._next_slot = 0.0
+        self._failures = 0
+        self._open_until = 0.0
+        self._cooldown = BREAKER_COOLDOWN
+
+    def _get_session(self, verify_ssl: bool) -> aiohttp.ClientSession:
+        """Return the pooled session for the given SSL policy."""
+        session = self._sessions.get(verify_ssl)
+        if session is None:
+            # Session adossée au connecteur de HA : keep-alive et cache DNS partagés
+            session = async_create_clientsession(
+                self.hass, verify_ssl=verify_ssl, trace_configs=[self.metrics.trace_config()]
+            )
+            self._sessions[verify_ssl] = session
+        return session
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return True while calls are refused by the circuit breaker."""
+        return self.hass.loop.time() < self._open_until
+
+    def _check_circuit(self) -> None:
+        if self.circuit_open:
+            remaining = self._open_until - self.hass.loop.time()
+            raise CircuitOpenError(f"API calls suspended for {remaining:.0f}s after repeated failures")
+
+    def _record_success(self) -> None:
+        self._failures = 0
+        self._cooldown = BREAKER_COOLDOWN
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= BREAKER_THRESHOLD:
+            # Disjoncteur ouvert ; chaque nouvelle ouverture double la pause
+            self._open_until = self.hass.loop.time() + self._cooldown
+            _LOGGER.warning(
+                f"API Vacances Scolaires en échec {self._failures} fois, appels suspendus {self._cooldown}s"
+            )
+            self._cooldown = min(self._cooldown * 2, BREAKER_MAX_COOLDOWN)
+            self._failures = 0
+
+    async def _async_wait_slot(self) -> None:
+        """Space request starts by at least MIN_REQUEST_INTERVAL seconds."""
+        async with self._rate_lock:
+            now = self.hass.loop.time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + MIN_REQUEST_INTERVAL
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _async_open(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        params: dict[str, Any],
+        headers: dict[str, str],
+        timeout: aiohttp.ClientTimeout,
+    ) -> aiohttp.ClientResponse:
+        """Send the request, retrying transient failures; the caller releases the response."""
+        attempt = 0
+        while True:
+            await self._async_wait_slot()
+            try:
+                response = await session.get(url, params=params, headers=headers, timeout=timeout)
+                if response.status == 429 or response.status >= 500:
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                    response.release()
+                    raise RetryableStatusError(response.status, retry_after)
+                return response
+            except (RetryableStatusError, aiohttp.ClientConnectionError, TimeoutError) as err:
+                if attempt + 1 >= MAX_ATTEMPTS:
+                    raise
+                if isinstance(err, RetryableStatusError) and (err.retry_after or 0) > MAX_RETRY_AFTER:
+                    # Attente demandée trop longue : on laisse le disjoncteur et le cache prendre le relais
+                    raise
+                # Backoff exponentiel avec gigue complète, au moins Retry-After
+                delay = random.uniform(0, RETRY_BASE_DELAY * 2**attempt)
+                if isinstance(err, RetryableStatusError) and err.retry_after is not None:
+                    delay = max(delay, err.retry_after)
+                _LOGGER.debug(f"Nouvelle tentative dans {delay:.1f}s après {err!r}")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _validator_key(self, path: str, params: dict[str, Any]) -> str:
+        """Return the key of the HTTP validators of a query."""
+        url = f"{self.base_url}/{path}" if path else self.base_url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def discard_validators(self, path: str, params: dict[str, Any]) -> None:
+        """Forget the validators of a query, so that the next call gets a full answer."""
+        self._validators.pop(self._validator_key(path, params), None)
+
+    async def async_get_json(
+        self,
+        path: str,
+        params: dict[str, Any],
+        verify_ssl: bool = True,
+        conditional: bool = False,
+    ) -> dict[str, Any] | None:
+        """GET a JSON document relative to the dataset URL.
+
+        With conditional=True the last ETag/Last-Modified of the same query are
+        sent, and None is returned when the server answers 304 Not Modified.
+        """
+        self._check_circuit()
+        session = self._get_session(verify_ssl)
+        url = f"{self.base_url}/{path}" if path else self.base_url
+        key = self._validator_key(path, params)
+        headers = {}
+        if conditional and key in self._validators:
+            etag, last_modified = self._validators[key]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        _LOGGER.debug(f"Appel API {url} avec verify_ssl={verify_ssl}")
+        try:
+            async with self._semaphore:
+                response = await self._async_open(
+                    session, url, params, headers, aiohttp.ClientTimeout(total=API_TIMEOUT)
+                )
+                async with response:
+                    if response.status == 304:
+                        self._record_success()
+                        return None
+                    if response.status != 200:
+                        raise VacancesScolairesApiError(f"Error communicating with API: {response.status}")
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        self._validators[key] = (etag, last_modified)
+                    with self.metrics.measure("body_read"):
+                        body = await response.read()
+                    self.metrics.bytes_received += len(body)
+        except (VacancesScolairesApiError, aiohttp.ClientError, TimeoutError):
+            self._record_failure()
+            raise
+        self._record_success()
+        with self.metrics.measure("json_decode"):
+            if len(body) > JSON_EXECUTOR_THRESHOLD:
+                return await self.hass.async_add_executor_job(json_loads, body)
+            return json_loads(body)
+
+    async def async_iter_lines(
+        self, path: str, params: dict[str, Any], verify_ssl: bool = True
+    ) -> AsyncIterator[bytes]:
+        """Stream a line-delimited response body, one line at a time.
+
+        Le corps est lu par blocs de EXPORT_CHUNK_SIZE : la mémoire reste bornée
+        quelle que soit la taille de l'export.
+        """
+        self._check_circuit()
+        session = self._get_session(verify_ssl)
+        url = f"{self.base_url}/{path}"
+        _LOGGER.debug(f"Export API {url} avec verify_ssl={verify_ssl}")
+        # Pas de délai global : seul un silence prolongé du serveur est une erreur
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=API_TIMEOUT, sock_read=API_TIMEOUT)
+        try:
+            async with self._semaphore:
+                response = await self._async_open(session, url, params, {}, timeout)
+                async with response:
+                    if response.status != 200:
+                        raise VacancesScolairesApiError(f"Error communicating with API: {response.status}")
+                    pending = b""
+                    read_time = 0.0
+                    while True:
+                        self.metrics.current = "body_read"
+                        start = time.perf_counter()
+                        chunk = await response.content.read(EXPORT_CHUNK_SIZE)
+                        read_time += time.perf_counter() - start
+                        if not chunk:
+                            break
+                        self.metrics.bytes_received += len(chunk)
+                        pending += chunk
+                        *lines, pending = pending.split(b"\n")
+                        for line in lines:
+                            if line.strip():
+                                yield line
+                    if pending.strip():
+                        yield pending
+                    # Temps passé à attendre le réseau, hors traitement des lignes
+                    self.metrics.add("body_read", read_time)
+        except (VacancesScolairesApiError, aiohttp.ClientError, TimeoutError):
+            self._record_failure()
+            raise
+        self._record_success()
+
+    async def async_close(self) -> None:
+        """Close the sessions opened by this client."""
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+
+def async_get_client(hass: HomeAssistant) -> VacancesScolairesApiClient:
+    """Return the client of this hass instance, creating it if needed."""
+    client = hass.data.get(DATA_CLIENT)
+    if client is None:
+        client = hass.data[DATA_CLIENT] = VacancesScolairesApiClient(hass)
+    return client
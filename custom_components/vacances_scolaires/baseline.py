@@ -0,0 +1,129 @@
+"""Bundled baseline of the calendar dataset, and merging of newer records.
+
+Ce module n'importe que la bibliothèque standard : le script de publication
+(script/build_baseline.py) le charge sans Home Assistant.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Généré à la publication d'une version ; absent d'une copie du dépôt
+BASELINE_PATH = Path(__file__).with_name("baseline.json.gz")
+BASELINE_VERSION = 1
+
+# Colonnes conservées, dans l'ordre des lignes du fichier
+BASELINE_FIELDS = ("description", "population", "start_date", "end_date", "location", "zones", "annee_scolaire")
+
+# Champs sans lesquels un enregistrement est inutilisable (changement de schéma amont)
+REQUIRED_FIELDS = ("start_date", "end_date", "location", "annee_scolaire")
+
+
+@dataclass(slots=True, frozen=True)
+class Baseline:
+    """Snapshot of the dataset shipped with the integration."""
+
+    built_at: str
+    dataset_modified: str | None
+    records: list[dict[str, Any]]
+
+
+def encode_baseline(records: Iterable[dict[str, Any]], built_at: str, dataset_modified: str | None) -> bytes:
+    """Return the compressed baseline file for the given records."""
+    # Colonnes nommées une seule fois : le fichier ne répète pas les clés à chaque ligne
+    payload = {
+        "version": BASELINE_VERSION,
+        "built_at": built_at,
+        "dataset_modified": dataset_modified,
+        "fields": BASELINE_FIELDS,
+        "rows": sorted(
+            ([record.get(field) for field in BASELINE_FIELDS] for record in records),
+            key=lambda row: (row[2] or "", row[4] or "", row[0] or "", row[1] or ""),
+        ),
+    }
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Baseline | None:
+    """Read the bundled baseline; return None if it is missing or unreadable."""
+    try:
+        with gzip.open(path, "rb") as file:
+            payload = json.loads(file.read())
+        if payload.get("version") != BASELINE_VERSION:
+            _LOGGER.warning(f"Version de l'instantané embarqué non prise en charge : {payload.get('version')}")
+            return None
+        fields = payload["fields"]
+        return Baseline(
+            built_at=payload["built_at"],
+            dataset_modified=payload.get("dataset_modified"),
+            records=[dict(zip(fields, row)) for row in payload["rows"]],
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as err:
+        _LOGGER.warning(f"Instantané embarqué illisible, ignoré : {err!r}")
+        return None
+
+
+def is_valid_record(record: dict[str, Any]) -> bool:
+    """Return True if the record has every field the integration relies on."""
+    return all(record.get(field) for field in REQUIRED_FIELDS)
+
+
+def record_key(record: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the identity of a record: school year, académie, population and period."""
+    return (
+        record.get("annee_scolaire"),
+        record.get("location"),
+        record.get("population"),
+        record.get("description"),
+        record.get("start_date"),
+    )
+
+
+def targets_of(records: Iterable[dict[str, Any]]) -> frozenset[tuple[str, str]]:
+    """Return the zones and locations that have records."""
+    targets = set()
+    for record in records:
+        targets.add(("zones", record.get("zones")))
+        targets.add(("location", record.get("location")))
+    return frozenset(targets)
+
+
+def merge_records(
+    current: list[dict[str, Any]], downloaded: list[dict[str, Any]], cutoff: str
+) -> tuple[list[dict[str, Any]], bool]:
+    """Merge a download into the records in memory.
+
+    Chaque (académie, année scolaire) présente dans le téléchargement remplace
+    celle en mémoire ; les autres sont gardées tant qu'elles ne sont pas
+    terminées avant la coupure. Return the merged records, and False with the
+    current list itself when nothing changed.
+    """
+    valid = [record for record in downloaded if is_valid_record(record)]
+    if downloaded and not valid:
+        _LOGGER.warning("Aucun enregistrement exploitable reçu (schéma modifié ?), données en mémoire conservées")
+    downloaded = valid
+    refreshed = {(record["location"], record["annee_scolaire"]) for record in downloaded}
+    merged: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for record in current:
+        if (record.get("end_date") or "")[:10] < cutoff:
+            continue
+        if (record.get("location"), record.get("annee_scolaire")) in refreshed:
+            continue
+        merged[record_key(record)] = record
+    for record in downloaded:
+        merged.setdefault(record_key(record), record)
+
+    previous = {record_key(record): record for record in current}
+    if merged.keys() == previous.keys() and all(previous[key] == record for key, record in merged.items()):
+        return current, False
+    return sorted(merged.values(), key=lambda r: r.get("start_date") or ""), True
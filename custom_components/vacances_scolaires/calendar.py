@@ -1,95 +1,102 @@
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
 from datetime import datetime
-from zoneinfo import ZoneInfo
-from .const import DOMAIN
-from .coordinator import get_timezone
+from .entity import VacancesScolairesEntity
+from .const import DOMAIN, CONF_POPULATION_ENTITIES, POPULATION_NAMES
 
-# Fonction pour convertir la date dans le bon format et ajouter un fuseau horaire
-def convert_to_iso_format(date_str, location):
-    # Créer un dictionnaire pour les mois en français
-    mois = {
-        "janvier": "01", "février": "02", "mars": "03", "avril": "04", "mai": "05", "juin": "06",
-        "juillet": "07", "août": "08", "septembre": "09", "octobre": "10", "novembre": "11", "décembre": "12"
-    }
+# Nombre de fenêtres (start_date, end_date) mémorisées par calendrier
+EVENTS_CACHE_SIZE = 32
 
-    # Extraire les parties de la date
-    day, month_str, year, _, time_str, _ = date_str.split(" ")
-
-    # Convertir le mois en chiffre
-    month = mois[month_str.lower()]
-
-    # Créer la chaîne avec le format ISO attendu
-    iso_format_date = f"{year}-{month}-{day}T{time_str}"
-
-    # Retourner la date au format ISO
-    return iso_format_date
-
-class VacancesScolairesCalendar(CoordinatorEntity, CalendarEntity):
+class VacancesScolairesCalendar(VacancesScolairesEntity, CalendarEntity):
     """Vacances Scolaires Calendar class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator)
-        self._attr_name = f"Vacances Scolaires {config_entry.title}"
-        self._attr_unique_id = f"{config_entry.entry_id}_calendar"
+    def __init__(self, coordinator, config_entry, population=None):
+        super().__init__(coordinator, config_entry)
         self.entry_id = config_entry.entry_id
+        # None : série par défaut (élèves) ; sinon une population du jeu de données
+        self.population = population
+        if population is None:
+            self._attr_name = f"Vacances Scolaires {config_entry.title}"
+            self._attr_unique_id = f"{config_entry.entry_id}_calendar"
+        else:
+            self._attr_name = f"Vacances Scolaires {POPULATION_NAMES[population]} {config_entry.title}"
+            self._attr_unique_id = f"{config_entry.entry_id}_calendar_{population}"
+        self._events_cache: dict[tuple[datetime, datetime], list[CalendarEvent]] = {}
+
+    def _index(self):
+        """Return the period index of this calendar's series."""
+        data = self.coordinator.data
+        if not data:
+            return None
+        if self.population is None:
+            return data.periods
+        return data.populations.get(self.population)
 
     @property
     def event(self):
         """Return the next upcoming event."""
-        if self.coordinator.data["on_vacation"]:
-            start_date_str = self.coordinator.data["start_date"]
-            end_date_str = self.coordinator.data["end_date"]
-            location = self.coordinator.data["location"]  # Localisation pour déterminer le fuseau horaire
-
-            # Récupérer le fuseau horaire correspondant à la localisation
-            timezone = get_timezone(location)  # Utiliser le fuseau horaire dynamique
-
-            # Convertir les dates en datetime et appliquer le fuseau horaire
-            start_date = datetime.fromisoformat(convert_to_iso_format(start_date_str, location)).astimezone(ZoneInfo(timezone))
-            end_date = datetime.fromisoformat(convert_to_iso_format(end_date_str, location)).astimezone(ZoneInfo(timezone))
-
+        data = self.coordinator.data
+        if not data:
+            return None
+        if self.population is None:
+            if data.on_vacation:
+                return CalendarEvent(
+                    start=data.start,
+                    end=data.end,
+                    summary=data.description or "",
+                )
+            return None
+        on_vacation, period = data.population_states.get(self.population, (False, None))
+        if on_vacation:
             return CalendarEvent(
-                start=start_date,
-                end=end_date,
-                summary=self.coordinator.data["description"],
+                start=period.start.astimezone(data.timezone),
+                end=period.end.astimezone(data.timezone),
+                summary=period.description or "",
             )
         return None
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop the memoized windows when new data arrives."""
+        self._events_cache.clear()
+        super()._handle_coordinator_update()
+
     async def async_get_events(self, hass, start_date, end_date):
         """Get all events in a specific time frame."""
-        events = []
-        if self.coordinator.data["on_vacation"]:
-            start_date_str = self.coordinator.data["start_date"]
-            end_date_str = self.coordinator.data["end_date"]
-            location = self.coordinator.data["location"]  # Localisation pour déterminer le fuseau horaire
-
-            # Récupérer le fuseau horaire correspondant à la localisation
-            timezone = get_timezone(location)  # Utiliser le fuseau horaire dynamique
-
-            # Convertir les dates en datetime et appliquer le fuseau horaire
-            event_start = datetime.fromisoformat(convert_to_iso_format(start_date_str, location)).astimezone(ZoneInfo(timezone))
-            event_end = datetime.fromisoformat(convert_to_iso_format(end_date_str, location)).astimezone(ZoneInfo(timezone))
+        key = (start_date, end_date)
+        events = self._events_cache.get(key)
+        if events is not None:
+            return events
 
-            if start_date <= event_end and end_date >= event_start:
-                event = CalendarEvent(
-                    start=event_start,
-                    end=event_end,
-                    summary=self.coordinator.data["description"],
-                )
-                events.append(event)
+        events = []
+        data = self.coordinator.data
+        index = self._index()
+        if index:
+            timezone = data.timezone
+            # Recherche par jours locaux dans l'index, puis filtre exact sur les horaires
+            for period in index.between(start_date.astimezone(timezone).date(), end_date.astimezone(timezone).date()):
+                event_start = period.start.astimezone(timezone)
+                event_end = period.end.astimezone(timezone)
+                if start_date <= event_end and end_date >= event_start:
+                    events.append(
+                        CalendarEvent(
+                            start=event_start,
+                            end=event_end,
+                            summary=period.description or "",
+                        )
+                    )
+
+        if len(self._events_cache) >= EVENTS_CACHE_SIZE:
+            self._events_cache.pop(next(iter(self._events_cache)))
+        self._events_cache[key] = events
         return events
-        
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self.entry_id)},
-            "name": "Vacances Scolaires",
-            "manufacturer": "Master13011",
-            "model": "API",
-        }
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the Vacances Scolaires Calendar platform."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    async_add_entities([VacancesScolairesCalendar(coordinator, config_entry)], True)
+    entities = [VacancesScolairesCalendar(coordinator, config_entry)]
+    if config_entry.options.get(CONF_POPULATION_ENTITIES):
+        entities += [
+            VacancesScolairesCalendar(coordinator, config_entry, population) for population in POPULATION_NAMES
+        ]
+    async_add_entities(entities)
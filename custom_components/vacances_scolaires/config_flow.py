@@ -4,9 +4,11 @@ from __future__ import annotations
 from homeassistant.core import callback
 
 from typing import Any
+import aiohttp
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigFlow, ConfigFlowResult, ConfigEntry, OptionsFlow
+from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig, SelectSelectorMode
 
 import logging
 
@@ -20,8 +22,11 @@ from .const import (
     DEFAULT_LOCATION,
     DEFAULT_UPDATE_INTERVAL,
     CONF_VERIFY_SSL,
+    DATA_STORE,
     ZONE_OPTIONS
 )
+from .api import VacancesScolairesApiClient, VacancesScolairesApiError
+from .store import VacancesScolairesCalendarStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +35,36 @@ class VacancesScolairesConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    # Calendrier utilisé pour l'index des localisations quand aucune entrée n'est chargée
+    _lookup_store: VacancesScolairesCalendarStore | None = None
+
+    async def _async_get_location_index(self) -> VacancesScolairesCalendarStore:
+        """Return a store whose location index is loaded, without leaving shared objects behind."""
+        store = self.hass.data.get(DATA_STORE)
+        if store is not None:
+            # Entrées déjà chargées : leur calendrier partagé sert aussi ici
+            await self._async_load_locations(store)
+            return store
+        if self._lookup_store is None:
+            # Calendrier et client jetables : rien ne reste dans hass.data si le flux est abandonné
+            client = VacancesScolairesApiClient(self.hass)
+            store = VacancesScolairesCalendarStore(self.hass, client)
+            try:
+                await store.async_load()
+                await self._async_load_locations(store, persist=False)
+            finally:
+                await client.async_close()
+            self._lookup_store = store
+        return self._lookup_store
+
+    @staticmethod
+    async def _async_load_locations(store: VacancesScolairesCalendarStore, persist: bool = True) -> None:
+        try:
+            # Sans effet si un téléchargement a déjà rempli l'index
+            await store.async_load_locations(persist=persist)
+        except (VacancesScolairesApiError, aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug(f"Index des localisations indisponible, saisie libre : {err}")
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -52,17 +87,36 @@ class VacancesScolairesConfigFlow(ConfigFlow, domain=DOMAIN):
     ) -> ConfigFlowResult:
         """Handle the location step."""
         errors: dict[str, str] = {}
+        store = await self._async_get_location_index()
+
         if user_input is not None:
-            # Validation possible ici
-            return self.async_create_entry(
-                title=f"Vacances Scolaires ({user_input[CONF_LOCATION]})",
-                data={**user_input, CONF_CONFIG_TYPE: "location"}
+            location = user_input[CONF_LOCATION]
+            resolved = store.resolve_location(location)
+            if resolved is None and store.locations:
+                errors[CONF_LOCATION] = "invalid_location"
+            else:
+                if resolved is not None:
+                    # Nom exact du jeu de données, quelle que soit la saisie
+                    location = resolved[0]
+                return self.async_create_entry(
+                    title=f"Vacances Scolaires ({location})",
+                    data={**user_input, CONF_LOCATION: location, CONF_CONFIG_TYPE: "location"}
+                )
+
+        location_field: Any = str
+        if store.locations:
+            location_field = SelectSelector(
+                SelectSelectorConfig(
+                    options=sorted({location for location, _ in store.locations.values()}),
+                    custom_value=True,
+                    mode=SelectSelectorMode.DROPDOWN,
+                )
             )
 
         return self.async_show_form(
             step_id="location",
             data_schema=vol.Schema({
-                vol.Required(CONF_LOCATION, default=DEFAULT_LOCATION): str,
+                vol.Required(CONF_LOCATION, default=DEFAULT_LOCATION): location_field,
                 vol.Required(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): int,
                 vol.Optional(CONF_CREATE_CALENDAR, default=False): bool,
                 vol.Optional(CONF_VERIFY_SSL, default=True): bool,
@@ -2,12 +2,48 @@
 
 DOMAIN = "vacances_scolaires"
 
+# Clés hass.data des objets partagés entre toutes les entrées
+DATA_CLIENT = f"{DOMAIN}_client"
+DATA_STORE = f"{DOMAIN}_store"
+DATA_ICS_VIEW = f"{DOMAIN}_ics_view"
+DATA_TIMERS = f"{DOMAIN}_timers"
+
+# Signal envoyé après chaque tentative de rafraîchissement du calendrier
+SIGNAL_METRICS_UPDATED = f"{DOMAIN}_metrics_updated"
+
+API_BASE_URL = "https://data.education.gouv.fr/api/explore/v2.1/catalog/datasets/fr-en-calendrier-scolaire"
+API_TIMEOUT = 10
+
+# Cache disque du calendrier (helper Store de HA)
+STORAGE_KEY = f"{DOMAIN}.calendar"
+STORAGE_VERSION = 1
+CACHE_TTL = 12 * 3600  # secondes
+
+# Délai aléatoire maximal avant la revalidation d'une entrée au démarrage (secondes)
+STARTUP_JITTER = 60
+
+# Mode grande échelle à partir de ce nombre d'entrées : un minuteur de
+# rafraîchissement commun porté par le calendrier partagé au lieu d'un par entrée
+SCALE_MODE_MIN_ENTRIES = 20
+
+# Sondage adaptatif : année scolaire suivante déjà publiée → sondages espacés de
+# 2 à 30 jours ; sinon proches de l'intervalle configuré, au plus 2 jours.
+# Chaque résultat inchangé double le délai.
+ADAPTIVE_COVERED_MIN = 2 * 24  # heures
+ADAPTIVE_COVERED_MAX = 30 * 24  # heures
+ADAPTIVE_PENDING_MAX = 2 * 24  # heures
+
+# Premier délai avant de retenter une entrée démarrée sans cache (secondes, doublé à chaque échec)
+FIRST_REFRESH_RETRY = 60
+
 CONF_LOCATION = "location"
 CONF_ZONE = "zone"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_CONFIG_TYPE = "config_type"
 CONF_CREATE_CALENDAR = "create_calendar"
 CONF_VERIFY_SSL = "verify_ssl"
+CONF_POPULATION_ENTITIES = "population_entities"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
 
 DEFAULT_LOCATION = ""
 DEFAULT_UPDATE_INTERVAL = 12
@@ -24,6 +60,14 @@ ATTR_ZONE = "zone"
 ATTR_ANNEE_SCOLAIRE = "année_scolaire"
 ATTR_EN_VACANCES = "en_vacances"
 
+# Populations du jeu de données (valeurs normalisées) ; « - » concerne tout le monde
+POPULATION_ALL = "-"
+POPULATION_DEFAULT = "eleves"
+POPULATION_NAMES = {
+    "eleves": "Élèves",
+    "enseignants": "Enseignants",
+}
+
 ZONE_OPTIONS = [
     "Zone A",
     "Zone B",
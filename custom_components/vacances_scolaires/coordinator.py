@@ -1,34 +1,27 @@
-from datetime import timedelta, date, datetime
+from dataclasses import dataclass
+from datetime import date, time, timedelta, datetime, tzinfo
 import logging
+from time import perf_counter
 from typing import Any
-import asyncio
 from zoneinfo import ZoneInfo
-import aiohttp
-import async_timeout
-import unicodedata
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_LOCATION, CONF_ZONE, CONF_CONFIG_TYPE, CONF_UPDATE_INTERVAL, CONF_VERIFY_SSL
+from .api import REQUEST_ERRORS, VacancesScolairesApiError
+from .ics import IcsFeed
+from .index import VacationIndex, VacationPeriod
+from .const import DOMAIN, SCALE_MODE_MIN_ENTRIES, CONF_ADAPTIVE_POLLING, POPULATION_ALL, POPULATION_DEFAULT, CONF_LOCATION, CONF_ZONE, CONF_CONFIG_TYPE, CONF_UPDATE_INTERVAL, CONF_VERIFY_SSL
+from .store import VacancesScolairesCalendarStore, next_poll_interval
+from .timers import async_get_shared_timers
+from .util import get_timezone, normalize_location, normalize_population
+from .view import EntryView
 
 _LOGGER = logging.getLogger(__name__)
 
-def get_timezone(location: str) -> str:
-    timezone_mapping = {
-        "Guadeloupe": "America/Guadeloupe",
-        "Guyane": "America/Cayenne",
-        "Martinique": "America/Martinique",
-        "Mayotte": "Indian/Mayotte",
-        "Nouvelle Calédonie": "Pacific/Noumea",
-        "Polynésie française": "Pacific/Tahiti",
-        "Réunion": "Indian/Reunion",
-        "Saint Pierre et Miquelon": "America/Miquelon",
-        "Wallis et Futuna": "Pacific/Wallis"
-    }
-    return timezone_mapping.get(location, "Europe/Paris")
-
 def traduire_mois(date_str: str) -> str:
     """Remplace les noms de mois en anglais par leur équivalent français."""
     mois_en = ["January", "February", "March", "April", "May", "June", 
@@ -41,19 +34,177 @@ def traduire_mois(date_str: str) -> str:
 
     return date_str
 
-def normalize_population(pop: str | None) -> str:
-    """Normalise le champ population (minuscules + sans accents)."""
-    if not pop:
-        return ""
-    pop_norm = unicodedata.normalize("NFD", pop).encode("ascii", "ignore").decode("utf-8")
-    return pop_norm.lower()
+@dataclass(slots=True, frozen=True)
+class VacancesScolairesData:
+    """Snapshot published by the coordinator to its entities."""
+
+    state: str
+    start: datetime
+    end: datetime
+    start_date_display: str
+    end_date_display: str
+    description: str
+    location: str | None
+    zone: str | None
+    annee_scolaire: str | None
+    on_vacation: bool
+    on_vacation_tomorrow: bool
+    periods: VacationIndex
+    timezone: tzinfo
+    # Série complète de chaque population publiée (eleves, enseignants…)
+    populations: dict[str, VacationIndex]
+    # Par population : en vacances aujourd'hui, et période en cours ou à venir
+    population_states: dict[str, tuple[bool, VacationPeriod | None]]
+    # Comptes à rebours, recalculés à chaque minuit local
+    next_start: datetime | None
+    next_end: datetime | None
+    days_until: int | None
+    days_remaining: int | None
+    school_year_progress: float | None
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse an API timestamp, assuming UTC when no offset is given."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.UTC)
+    return parsed
+
+
+def _to_period(record: dict[str, Any]) -> VacationPeriod:
+    """Convert an API record to a period."""
+    return VacationPeriod(
+        description=record.get("description"),
+        start=_parse_datetime(record["start_date"]),
+        end=_parse_datetime(record["end_date"]),
+        zone=record.get("zones"),
+        location=record.get("location"),
+        annee_scolaire=record.get("annee_scolaire"),
+        population=record.get("population"),
+    )
+
+
+def _dedupe(chosen: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Keep one record per (description, start, end)."""
+    # Une zone regroupe plusieurs académies aux dates le plus souvent identiques
+    unique: dict[tuple[Any, Any, Any], dict[str, Any]] = {}
+    for record in chosen:
+        unique.setdefault((record.get("description"), record["start_date"], record["end_date"]), record)
+    return list(unique.values())
+
+
+def build_indexes(
+    records: list[dict[str, Any]], tz: tzinfo
+) -> tuple[VacationIndex, dict[str, VacationIndex]]:
+    """Index the periods of a slice: default series and one series per population.
+
+    Un seul passage regroupe les enregistrements par période (année scolaire +
+    description + académie) et par population normalisée, la normalisation
+    n'étant calculée qu'une fois par valeur distincte. La série par défaut garde
+    les Élèves, à défaut « - », à défaut le premier enregistrement ; la série
+    d'une population garde la sienne, à défaut « - » (tout le monde).
+    """
+    normalized: dict[str | None, str] = {}
+    groups: dict[tuple[Any, Any, Any], dict[str, dict[str, Any]]] = {}
+    for record in records:
+        if not record.get("start_date") or not record.get("end_date"):
+            continue
+        raw = record.get("population")
+        population = normalized.get(raw)
+        if population is None:
+            population = normalized[raw] = normalize_population(raw)
+        key = (record.get("annee_scolaire"), record.get("description"), record.get("location"))
+        groups.setdefault(key, {}).setdefault(population, record)
+
+    populations = {population for population in normalized.values() if population not in (POPULATION_ALL, "")}
+    default: list[dict[str, Any]] = []
+    by_population: dict[str, list[dict[str, Any]]] = {population: [] for population in populations}
+    for group in groups.values():
+        default.append(
+            group.get(POPULATION_DEFAULT) or group.get(POPULATION_ALL) or next(iter(group.values()))
+        )
+        for population, chosen in by_population.items():
+            record = group.get(population) or group.get(POPULATION_ALL)
+            if record is not None:
+                chosen.append(record)
+
+    # Un enregistrement « - » sert à plusieurs séries : converti une seule fois
+    converted: dict[int, VacationPeriod] = {}
+
+    def _series(chosen: list[dict[str, Any]]) -> VacationIndex:
+        periods = []
+        for record in _dedupe(chosen):
+            period = converted.get(id(record))
+            if period is None:
+                period = converted[id(record)] = _to_period(record)
+            periods.append(period)
+        return VacationIndex(periods, tz)
+
+    return _series(default), {population: _series(chosen) for population, chosen in by_population.items()}
 
-class VacancesScolairesDataUpdateCoordinator(DataUpdateCoordinator):
+
+def _population_state(index: VacationIndex, today: date) -> tuple[bool, VacationPeriod | None]:
+    """Return whether today is a vacation day, and the current or next period."""
+    period = index.period_at(today)
+    if period is not None:
+        return True, period
+    return False, index.next_period(today)
+
+
+def _is_summer(period: VacationPeriod) -> bool:
+    """Return True for the summer vacation, which closes a school year."""
+    return "ete" in normalize_location(period.description).split()
+
+
+def school_year_progress(index: VacationIndex, today: date, tz: tzinfo) -> float | None:
+    """Return the share of the school year elapsed, from rentrée to summer vacation (%)."""
+    rentree = fin = None
+    for period in index.periods:
+        if not _is_summer(period):
+            continue
+        if period.end.astimezone(tz).date() <= today:
+            rentree = period.end.astimezone(tz).date()
+        elif period.start.astimezone(tz).date() > today:
+            fin = period.start.astimezone(tz).date()
+            break
+        else:
+            # Pendant les grandes vacances : année terminée
+            return 100.0
+    if rentree is None or fin is None:
+        return None
+    return round((today - rentree).days / (fin - rentree).days * 100, 1)
+
+
+async def async_get_indexes(
+    hass: HomeAssistant, store: VacancesScolairesCalendarStore, field: str, value: str, tz: ZoneInfo
+) -> tuple[VacationIndex, dict[str, VacationIndex]]:
+    """Return the indexes of a slice, shared by every caller until the next data.
+
+    La tranche est prise sur la boucle et l'index construit dans l'exécuteur
+    à partir de cette liste : le cache partagé n'est lu et écrit que sur la
+    boucle. Les mesures sont prises sur la boucle.
+    """
+    metrics = store.client.metrics
+    key = (field, value, tz.key)
+    while (indexes := store.index_cache.get(key)) is None:
+        generation = store.records_generation
+        records = store.async_get_slice(field, value)
+        start = perf_counter()
+        indexes = await hass.async_add_executor_job(build_indexes, records, tz)
+        metrics.add("indexing", perf_counter() - start)
+        if store.records_generation == generation:
+            store.index_cache[key] = indexes
+        # Sinon, enregistrements remplacés pendant la construction : on recommence sur les nouveaux
+    return indexes
+
+
+class VacancesScolairesDataUpdateCoordinator(DataUpdateCoordinator[VacancesScolairesData]):
     """Class to manage fetching Vacances Scolaires data."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, store: VacancesScolairesCalendarStore) -> None:
         """Initialize the data updater."""
         self.entry = entry  # Stocker la ConfigEntry
+        self.store = store  # Calendrier partagé entre les entrées
         self.config = entry.data  # Données de configuration initiales
         self.options = entry.options  # Options modifiables après configuration
 
@@ -73,88 +224,264 @@ class VacancesScolairesDataUpdateCoordinator(DataUpdateCoordinator):
                 _LOGGER.warning(f"Valeur d'intervalle invalide ({hours_val}), utilisation de 12 heures par défaut")
                 hours_int = 12
 
-        update_interval = timedelta(hours=hours_int)
+        self.refresh_interval = timedelta(hours=hours_int)
+        # Sondage adaptatif : délai recalculé après chaque rafraîchissement (couverture, résultats inchangés)
+        self.adaptive = self.options.get(CONF_ADAPTIVE_POLLING, False)
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
+        # Au-delà de SCALE_MODE_MIN_ENTRIES entrées, le calendrier partagé rafraîchit pour toutes
+        self.scale_mode = len(hass.config_entries.async_entries(DOMAIN)) >= SCALE_MODE_MIN_ENTRIES
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API endpoint."""
-        verify_ssl = self.entry.options.get(
-            CONF_VERIFY_SSL,
-            self.config.get(CONF_VERIFY_SSL, True)
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=None if self.scale_mode else self.refresh_interval,
+            always_update=False,
         )
-        _LOGGER.debug(f"Appel API avec verify_ssl={verify_ssl}")
 
-        today_str = date.today().isoformat()
         config_type = self.config.get(CONF_CONFIG_TYPE, "location")
-
         if config_type == "location":
-            location = self.config.get(CONF_LOCATION)
-            api_url = (
-                f"https://data.education.gouv.fr/api/explore/v2.1/catalog/datasets/fr-en-calendrier-scolaire/"
-                f"records?where=end_date%3E%3Ddate%27{today_str}%27&order_by=start_date%20ASC&limit=2&refine=location%3A{location}"
-            )
+            self._field, self._value = "location", self.config.get(CONF_LOCATION)
         elif config_type == "zone":
-            zone = self.config.get(CONF_ZONE)
-            api_url = (
-                f"https://data.education.gouv.fr/api/explore/v2.1/catalog/datasets/fr-en-calendrier-scolaire/"
-                f"records?where=end_date%3E%3Ddate%27{today_str}%27&order_by=start_date%20ASC&limit=2&refine=zones%3A{zone}"
-            )
+            self._field, self._value = "zones", self.config.get(CONF_ZONE)
         else:
-            raise UpdateFailed("Invalid configuration type")
+            raise ValueError(f"Invalid configuration type: {config_type}")
+        # Requête partagée : la zone de l'académie quand l'index la connaît
+        self._target = (self._field, self._value)
+        timezone = get_timezone(self._value)
+        if config_type == "location" and (resolved := store.resolve_location(self._value)) is not None:
+            self._value, zone, timezone = resolved
+            self._target = ("zones", zone)
+        # Fuseaux mis en cache pour tout le processus par HA
+        self._tz = dt_util.get_time_zone(timezone)
+
+        verify_ssl = self.options.get(CONF_VERIFY_SSL, self.config.get(CONF_VERIFY_SSL, True))
+        entry.async_on_unload(
+            store.async_register(
+                entry.entry_id,
+                *self._target,
+                verify_ssl,
+                self._handle_store_update,
+                poll_interval=self.refresh_interval if self.scale_mode else None,
+                adaptive=self.adaptive,
+            )
+        )
+
+        # Modèle de vue partagé par les entités, reconstruit à chaque nouvel instantané
+        self.view: EntryView | None = None
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Vacances Scolaires",
+            manufacturer="Master13011",
+            model="API",
+        )
+
+        # Flux iCalendar rendu à la demande, une fois par index
+        self._ics_feed: IcsFeed | None = None
+
+        # Prochaine bascule connue (minuit local, début ou fin de vacances), sur un minuteur commun
+        self._timers = async_get_shared_timers(hass)
+        self._unsub_boundary: CALLBACK_TYPE | None = None
+        entry.async_on_unload(self._cancel_boundary)
+
+    @property
+    def slice_key(self) -> tuple[str, str]:
+        """Return the field and value selecting this entry's records."""
+        return self._field, self._value
+
+    @callback
+    def async_get_ics_feed(self) -> IcsFeed:
+        """Return the rendered feed, rendering it again only if the periods changed."""
+        index = self.data.periods
+        if self._ics_feed is None or self._ics_feed.index is not index:
+            self._ics_feed = IcsFeed.build(self.entry.title, index, self._tz)
+        return self._ics_feed
+
+    @callback
+    def _cancel_boundary(self) -> None:
+        """Cancel the pending boundary callback."""
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+
+    def _next_boundary(self, now: datetime) -> datetime:
+        """Return the next moment the snapshot can change without new data."""
+        local_now = now.astimezone(self._tz)
+        tomorrow = local_now.date() + timedelta(days=1)
+        candidates = [datetime.combine(tomorrow, time.min, self._tz)]
+        if self.data:
+            for index in (self.data.periods, *self.data.populations.values()):
+                current = index.period_at(local_now.date())
+                if current is not None:
+                    candidates.append(current.end)
+                upcoming = index.next_period(local_now.date())
+                if upcoming is not None:
+                    candidates.append(upcoming.start)
+        return min(c for c in candidates if c > now)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and schedule the next boundary."""
+        if self.data is not None and (self.view is None or self.view.data is not self.data):
+            self.view = EntryView.build(self.data)
+        super().async_update_listeners()
+        self._cancel_boundary()
+        if self.data:
+            self._unsub_boundary = self._timers.async_schedule(
+                self._next_boundary(dt_util.utcnow()), self._async_boundary_tick
+            )
+
+    @callback
+    def _async_boundary_tick(self, now: datetime) -> None:
+        """Recompute the snapshot locally at a boundary, without calling the API."""
+        self._unsub_boundary = None
+        if not self.data:
+            return
+        self.entry.async_create_background_task(
+            self.hass, self._async_boundary_refresh(now), f"{DOMAIN}_boundary_{self.entry.entry_id}"
+        )
+
+    async def _async_boundary_refresh(self, now: datetime) -> None:
+        current = self.data
+        try:
+            data = await self._async_build_snapshot(current.periods, current.populations)
+        except UpdateFailed as err:
+            _LOGGER.debug(f"Plus de période connue pour {self.entry.title}: {err}")
+            return
+        if self.data is not current:
+            # Nouvelles données publiées entre-temps : elles ont replanifié la bascule
+            return
+        if data == current:
+            # Rien n'a changé pour les entités : on replanifie seulement
+            self._unsub_boundary = self._timers.async_schedule(
+                self._next_boundary(now), self._async_boundary_tick
+            )
+            return
+        # Pas de async_set_updated_data : il repousserait le prochain appel API
+        self.data = data
+        self.async_update_listeners()
 
+    async def async_restore_from_cache(self) -> bool:
+        """Publish the data of the disk cache, if it covers this entry."""
+        if not self.store.covers(*self._target):
+            return False
         try:
-            async with async_timeout.timeout(10):
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(api_url, ssl=verify_ssl) as response:
-                        if response.status != 200:
-                            raise UpdateFailed(f"Error communicating with API: {response.status}")
-                        data = await response.json()
-                        
-                        if not data.get("results"):
-                            raise UpdateFailed("No data received from API")
-                        
-                        results = data.get("results", [])
-
-                        # Filtrer pour prioriser Élèves
-                        eleves = [r for r in results if normalize_population(r.get("population")) == "eleves"]
-                        tous = [r for r in results if r.get("population") == "-"]
-                        
-                        if eleves:
-                            result = eleves[0]
-                        elif tous:
-                            result = tous[0]
-                        else:
-                            # fallback, si vraiment rien trouvé
-                            result = results[0] if results else None
-                        
-                        if not result:
-                            raise UpdateFailed("No suitable vacation data found")
-
-                        # Parse dates en datetime avec timezone UTC
-                        start_date_raw = datetime.fromisoformat(result['start_date']).replace(tzinfo=ZoneInfo("UTC"))
-                        end_date_raw = datetime.fromisoformat(result['end_date']).replace(tzinfo=ZoneInfo("UTC"))
-
-                        today = datetime.now(ZoneInfo("UTC")).replace(hour=0, minute=0, second=0, microsecond=0)
-                        on_vacation = start_date_raw <= today <= end_date_raw
-
-                        state = f"{result['zones']} - Holidays" if on_vacation else f"{result['zones']} - Work"
-
-                        # Formatage des dates traduites
-                        start_date_formatted = traduire_mois(start_date_raw.strftime("%d %B %Y à %H:%M:%S %Z"))
-                        end_date_formatted = traduire_mois(end_date_raw.strftime("%d %B %Y à %H:%M:%S %Z"))
-
-                        return {
-                            "state": state,
-                            "start_date": start_date_formatted,
-                            "end_date": end_date_formatted,
-                            "description": result['description'],
-                            "location": result.get('location'),
-                            "zone": result.get('zones'),
-                            "année_scolaire": result.get('annee_scolaire'),
-                            "on_vacation": on_vacation
-                        }
-        except aiohttp.ClientError as err:
+            data = await self._async_build_data()
+        except UpdateFailed:
+            return False
+        self._adapt_update_interval(data)
+        self.async_set_updated_data(data)
+        return True
+
+    def _adapt_update_interval(self, data: VacancesScolairesData) -> None:
+        """Set the delay before the next poll from the coverage of the data (adaptive polling)."""
+        if not self.adaptive or self.scale_mode:
+            return
+        today = datetime.now(self._tz).date()
+        interval = next_poll_interval(data.periods.last_day(), today, self.store.unchanged_polls, self.refresh_interval)
+        if interval != self.update_interval:
+            _LOGGER.debug(f"Prochain rafraîchissement de {self.entry.title} dans {interval}")
+            self.update_interval = interval
+
+    async def _async_update_data(self) -> VacancesScolairesData:
+        """Fetch data from the shared calendar store."""
+        data = await self._async_fetch_data()
+        self._adapt_update_interval(data)
+        return data
+
+    async def _async_fetch_data(self) -> VacancesScolairesData:
+        """Return the snapshot of the latest records, downloading them if needed."""
+        try:
+            changed = await self.store.async_fetch(self.entry.entry_id, self.refresh_interval / 2)
+        except REQUEST_ERRORS as err:
+            # API injoignable : on continue avec les dernières données connues
+            if self.store.covers(*self._target):
+                _LOGGER.warning(f"API indisponible ({err!r}), utilisation du cache pour {self.entry.title}")
+                return await self._async_build_data()
+            if isinstance(err, VacancesScolairesApiError):
+                raise UpdateFailed(str(err))
+            if isinstance(err, TimeoutError):
+                raise UpdateFailed("Timeout fetching Vacances Scolaires data")
             raise UpdateFailed(f"Error communicating with API: {err}")
-        except asyncio.TimeoutError:
-            raise UpdateFailed("Timeout fetching Vacances Scolaires data")
+
+        if not changed and self.data:
+            # Données inchangées : même index, donc pas de mise à jour des entités
+            return await self._async_build_snapshot(self.data.periods, self.data.populations)
+        return await self._async_build_data()
+
+    @callback
+    def _handle_store_update(self) -> None:
+        """Publish the new slice fetched on behalf of another entry."""
+        self.entry.async_create_background_task(
+            self.hass, self._async_publish_store_update(), f"{DOMAIN}_store_update_{self.entry.entry_id}"
+        )
+
+    async def _async_publish_store_update(self) -> None:
+        try:
+            data = await self._async_build_data()
+        except UpdateFailed as err:
+            _LOGGER.debug(f"Pas de données pour {self.entry.title}: {err}")
+            return
+        self._adapt_update_interval(data)
+        self.async_set_updated_data(data)
+
+    async def _async_build_data(self) -> VacancesScolairesData:
+        """Build the entry snapshot from its slice of the dataset."""
+        # Index partagés entre les entrées de même tranche, jusqu'aux prochaines données
+        index, populations = await async_get_indexes(self.hass, self.store, self._field, self._value, self._tz)
+        if not index:
+            raise UpdateFailed("No data received from API")
+        start = perf_counter()
+        data = await self._async_build_snapshot(index, populations)
+        self.store.client.metrics.add("formatting", perf_counter() - start)
+        return data
+
+    async def _async_build_snapshot(
+        self, index: VacationIndex, populations: dict[str, VacationIndex]
+    ) -> VacancesScolairesData:
+        """Build the snapshot of the current day in the executor."""
+        return await self.hass.async_add_executor_job(self._build_snapshot, index, populations)
+
+    def _build_snapshot(
+        self, index: VacationIndex, populations: dict[str, VacationIndex]
+    ) -> VacancesScolairesData:
+        """Build the entry snapshot for the current local day."""
+        today = datetime.now(self._tz).date()
+        period = index.period_at(today)
+        on_vacation = period is not None
+        if period is None:
+            period = index.next_period(today)
+        if period is None:
+            raise UpdateFailed("No suitable vacation data found")
+
+        state = f"{period.zone} - Holidays" if on_vacation else f"{period.zone} - Work"
+        upcoming = index.next_period(today)
+
+        # Chaînes traduites calculées une seule fois, pour les attributs
+        start_utc = period.start.astimezone(dt_util.UTC)
+        end_utc = period.end.astimezone(dt_util.UTC)
+
+        return VacancesScolairesData(
+            state=state,
+            start=period.start.astimezone(self._tz),
+            end=period.end.astimezone(self._tz),
+            start_date_display=traduire_mois(start_utc.strftime("%d %B %Y à %H:%M:%S %Z")),
+            end_date_display=traduire_mois(end_utc.strftime("%d %B %Y à %H:%M:%S %Z")),
+            description=period.description,
+            location=period.location,
+            zone=period.zone,
+            annee_scolaire=period.annee_scolaire,
+            on_vacation=on_vacation,
+            on_vacation_tomorrow=index.is_vacation(today + timedelta(days=1)),
+            periods=index,
+            populations=populations,
+            population_states={
+                population: _population_state(series, today) for population, series in populations.items()
+            },
+            timezone=self._tz,
+            next_start=upcoming.start.astimezone(self._tz) if upcoming else None,
+            next_end=upcoming.end.astimezone(self._tz) if upcoming else None,
+            days_until=(upcoming.start.astimezone(self._tz).date() - today).days if upcoming else None,
+            days_remaining=(period.end.astimezone(self._tz).date() - today).days if on_vacation else None,
+            school_year_progress=school_year_progress(index, today, self._tz),
+        )
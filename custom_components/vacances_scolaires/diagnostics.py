@@ -0,0 +1,53 @@
+"""Diagnostics support for Vacances Scolaires."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import VacancesScolairesDataUpdateCoordinator
+from .ics import ICS_URL
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: VacancesScolairesDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    store = coordinator.store
+    data = coordinator.data
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "entry_id": entry.entry_id,
+            "ics_url": ICS_URL.format(entry_id=entry.entry_id),
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": repr(coordinator.last_exception) if coordinator.last_exception else None,
+            "update_interval": str(coordinator.refresh_interval),
+            "scale_mode": coordinator.scale_mode,
+            "adaptive_polling": coordinator.adaptive,
+            "next_update_in": str(coordinator.update_interval) if coordinator.update_interval else None,
+            "state": data.state if data else None,
+            "on_vacation": data.on_vacation if data else None,
+            "periods": len(data.periods) if data else 0,
+        },
+        "store": {
+            "records": len(store.records),
+            "fetched_at": store.fetched_at.isoformat() if store.fetched_at else None,
+            "dataset_modified": store.dataset_modified,
+            "ingestion_mode": store.ingestion_mode,
+            "freshness_hits": store.freshness_hits,
+            "unchanged_polls": store.unchanged_polls,
+            "validation_hits": store.validation_hits,
+            "validation_misses": store.validation_misses,
+            "cache_hit_ratio": store.cache_hit_ratio,
+        },
+        "metrics": store.client.metrics.as_dict(),
+    }
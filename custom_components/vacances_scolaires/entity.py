@@ -0,0 +1,62 @@
+"""Base entity of the Vacances Scolaires integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_CONFIG_TYPE, CONF_LOCATION, CONF_ZONE
+from .coordinator import VacancesScolairesDataUpdateCoordinator
+from .view import EntryView
+
+
+class VacancesScolairesEntity(CoordinatorEntity[VacancesScolairesDataUpdateCoordinator]):
+    """Coordinator entity reading the shared view-model of its entry.
+
+    Un rafraîchissement qui ne change rien pour cette entité n'écrit pas d'état :
+    ni événement state_changed ni ligne dans le recorder.
+    """
+
+    _last_written: tuple[Any, ...] | None = None
+
+    def __init__(self, coordinator: VacancesScolairesDataUpdateCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entry = entry
+        self.config_type = entry.data.get(CONF_CONFIG_TYPE, "location")
+        # Localisation ou zone configurée, reprise dans les noms et identifiants
+        self.target = entry.data.get(CONF_LOCATION if self.config_type == "location" else CONF_ZONE, "Unknown")
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def view(self) -> EntryView | None:
+        """Return the view-model of the entry, shared by all its entities."""
+        return self.coordinator.view
+
+    def _written_state(self) -> tuple[Any, ...]:
+        """Return everything that ends up in the state machine."""
+        if not self.available:
+            # HA ne lit ni l'état ni les attributs d'une entité indisponible
+            return (False,)
+        return (True, self.state, self.state_attributes, self.extra_state_attributes)
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state unless it is identical to the last written one."""
+        written = self._written_state()
+        if written == self._last_written:
+            return
+        self._last_written = written
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity was added."""
+        await super().async_added_to_hass()
+        self._last_written = self._written_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state_if_changed()
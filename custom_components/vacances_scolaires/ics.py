@@ -0,0 +1,172 @@
+"""iCalendar feed of the vacation periods, served by Home Assistant's HTTP server."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, tzinfo
+import gzip
+import hashlib
+from http import HTTPStatus
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_ICS_VIEW, DOMAIN
+from .index import VacationIndex
+
+ICS_URL = f"/api/{DOMAIN}/{{entry_id}}.ics"
+
+# Les clients agenda repassent au plus tôt après ce délai (secondes)
+ICS_MAX_AGE = 3600
+
+# Longueur maximale d'une ligne iCalendar (octets, RFC 5545 §3.1)
+_LINE_LIMIT = 75
+
+
+def _escape(value: str) -> str:
+    """Escape a TEXT value."""
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> bytes:
+    """Encode one content line, folded at 75 octets without splitting a character."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= _LINE_LIMIT:
+        return encoded + b"\r\n"
+    parts = []
+    current = b""
+    limit = _LINE_LIMIT
+    for char in line:
+        char_bytes = char.encode("utf-8")
+        if len(current) + len(char_bytes) > limit:
+            parts.append(current)
+            current = b""
+            # Les lignes de continuation commencent par une espace
+            limit = _LINE_LIMIT - 1
+        current += char_bytes
+    parts.append(current)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _day_after_end(end: datetime, tz: tzinfo) -> str:
+    """Return the exclusive DTEND date of a period ending at the given moment."""
+    local = end.astimezone(tz)
+    day = local.date()
+    if local.time() != time.min:
+        day += timedelta(days=1)
+    return day.strftime("%Y%m%d")
+
+
+def render_ics(name: str, index: VacationIndex, tz: tzinfo) -> bytes:
+    """Render every period of the index as an iCalendar document."""
+    stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{DOMAIN}//Home Assistant//FR",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for period in index.periods:
+        start = period.start.astimezone(tz).date()
+        uid = hashlib.sha1(
+            f"{period.description}|{start.isoformat()}|{period.zone}|{period.location}".encode()
+        ).hexdigest()
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{uid}@{DOMAIN}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{_day_after_end(period.end, tz)}",
+            # Enregistrement sans description : événement sans titre plutôt qu'une erreur 500
+            f"SUMMARY:{_escape(period.description or '')}",
+            "TRANSP:TRANSPARENT",
+        ]
+        if period.location:
+            lines.append(f"LOCATION:{_escape(period.location)}")
+        if period.zone or period.annee_scolaire:
+            details = " - ".join(value for value in (period.zone, period.annee_scolaire) if value)
+            lines.append(f"DESCRIPTION:{_escape(details)}")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return b"".join(_fold(line) for line in lines)
+
+
+@dataclass(slots=True, frozen=True)
+class IcsFeed:
+    """Rendered feed of one entry, kept until its index changes."""
+
+    index: VacationIndex
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, name: str, index: VacationIndex, tz: tzinfo) -> IcsFeed:
+        """Render and compress the feed once."""
+        body = render_ics(name, index, tz)
+        return cls(
+            index=index,
+            body=body,
+            gzip_body=gzip.compress(body, mtime=0),
+            etag=hashlib.sha1(body).hexdigest(),
+        )
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    """Return True if If-None-Match lists the given entity tag (weak comparison)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class VacancesScolairesIcsView(HomeAssistantView):
+    """Serve the vacation periods of a config entry as an .ics feed.
+
+    Le flux ne lit que les données déjà en mémoire : aucune requête d'un client
+    agenda ne déclenche d'appel à l'API. Les données sont publiques, l'URL
+    reprend l'identifiant de l'entrée.
+    """
+
+    url = ICS_URL
+    name = f"api:{DOMAIN}:ics"
+    requires_auth = False
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the feed, a 304 if the client copy is current, or a 404."""
+        hass: HomeAssistant = request.app["hass"]
+        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is None or not coordinator.data:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        feed = coordinator.async_get_ics_feed()
+
+        gzipped = "gzip" in request.headers.get("Accept-Encoding", "")
+        # Une représentation compressée a son propre ETag fort
+        etag = f'"{feed.etag}-gz"' if gzipped else f'"{feed.etag}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={ICS_MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("If-None-Match"), etag):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        if gzipped:
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(
+            body=feed.gzip_body if gzipped else feed.body,
+            content_type="text/calendar",
+            charset="utf-8",
+            headers=headers,
+        )
+
+
+@callback
+def async_register_ics_view(hass: HomeAssistant) -> None:
+    """Register the feed view once per hass instance."""
+    if not hass.data.get(DATA_ICS_VIEW):
+        hass.http.register_view(VacancesScolairesIcsView())
+        hass.data[DATA_ICS_VIEW] = True
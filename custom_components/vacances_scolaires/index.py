@@ -0,0 +1,107 @@
+"""Sorted interval index of the vacation periods of one zone or location."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, tzinfo
+
+
+@dataclass(slots=True, frozen=True)
+class VacationPeriod:
+    """One vacation period, as published by the API."""
+
+    description: str
+    start: datetime
+    end: datetime
+    zone: str | None
+    location: str | None
+    annee_scolaire: str | None
+    population: str | None
+
+
+class VacationIndex:
+    """Periods sorted by start, with day numbers kept in compact arrays.
+
+    Les bornes sont des jours locaux (date.toordinal) dans le fuseau de la zone,
+    l'intervalle est semi-ouvert : [premier jour de vacances, jour de reprise).
+    """
+
+    __slots__ = ("periods", "_starts", "_ends", "_max_ends")
+
+    def __init__(self, periods: list[VacationPeriod], tz: tzinfo) -> None:
+        """Build the index."""
+        self.periods = sorted(periods, key=lambda p: p.start)
+        self._starts = array("l", (p.start.astimezone(tz).date().toordinal() for p in self.periods))
+        self._ends = array("l", (p.end.astimezone(tz).date().toordinal() for p in self.periods))
+        # Fin maximale cumulée : permet de s'arrêter tôt si des périodes se chevauchent
+        self._max_ends = array("l")
+        running = 0
+        for end in self._ends:
+            running = max(running, end)
+            self._max_ends.append(running)
+
+    def __len__(self) -> int:
+        """Return the number of indexed periods."""
+        return len(self.periods)
+
+    def period_at(self, day: date) -> VacationPeriod | None:
+        """Return the period covering the given local day, if any."""
+        ordinal = day.toordinal()
+        i = bisect_right(self._starts, ordinal) - 1
+        while i >= 0 and self._max_ends[i] > ordinal:
+            if self._ends[i] > ordinal:
+                return self.periods[i]
+            i -= 1
+        return None
+
+    def periods_at(self, days: list[date]) -> list[VacationPeriod | None]:
+        """Return the period covering each of the given local days, in one pass.
+
+        Les jours sont triés puis parcourus avec un curseur unique sur les débuts :
+        coût O(jours + périodes) au lieu d'une recherche par jour.
+        """
+        order = sorted(range(len(days)), key=lambda k: days[k])
+        found: list[VacationPeriod | None] = [None] * len(days)
+        count = len(self.periods)
+        i = 0
+        for k in order:
+            ordinal = days[k].toordinal()
+            while i < count and self._starts[i] <= ordinal:
+                i += 1
+            j = i - 1
+            while j >= 0 and self._max_ends[j] > ordinal:
+                if self._ends[j] > ordinal:
+                    found[k] = self.periods[j]
+                    break
+                j -= 1
+        return found
+
+    def first_day(self) -> date | None:
+        """Return the first day covered by the index (start of the earliest period)."""
+        return date.fromordinal(self._starts[0]) if self.periods else None
+
+    def is_vacation(self, day: date) -> bool:
+        """Return True if the given local day is a vacation day."""
+        return self.period_at(day) is not None
+
+    def next_period(self, day: date) -> VacationPeriod | None:
+        """Return the first period starting strictly after the given local day."""
+        i = bisect_right(self._starts, day.toordinal())
+        return self.periods[i] if i < len(self.periods) else None
+
+    def between(self, start: date, end: date) -> list[VacationPeriod]:
+        """Return the periods overlapping the local days [start, end], in start order."""
+        first, last = start.toordinal(), end.toordinal()
+        i = bisect_right(self._starts, last) - 1
+        found = []
+        while i >= 0 and self._max_ends[i] > first:
+            if self._ends[i] > first:
+                found.append(self.periods[i])
+            i -= 1
+        found.reverse()
+        return found
+
+    def last_day(self) -> date | None:
+        """Return the last day covered by the index (exclusive end of the latest period)."""
+        return date.fromordinal(self._max_ends[-1]) if self.periods else None
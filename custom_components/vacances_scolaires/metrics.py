@@ -0,0 +1,164 @@
+"""Timing and volume metrics of the refresh path."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+import socket
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.util import dt as dt_util
+
+# Nombre d'échantillons conservés par histogramme
+HISTOGRAM_SIZE = 100
+
+# Phases mesurées, dans l'ordre du chemin de rafraîchissement
+PHASES = ("dns", "connect", "request", "body_read", "json_decode", "filtering", "indexing", "formatting", "total")
+
+
+class RollingHistogram:
+    """Last HISTOGRAM_SIZE durations of one phase, in milliseconds."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self._samples: deque[float] = deque(maxlen=HISTOGRAM_SIZE)
+
+    def add(self, value_ms: float) -> None:
+        """Record one sample."""
+        self._samples.append(value_ms)
+
+    @property
+    def last(self) -> float | None:
+        """Return the latest sample."""
+        return self._samples[-1] if self._samples else None
+
+    def summary(self) -> dict[str, Any]:
+        """Return count, last value and percentiles."""
+        if not self._samples:
+            return {"count": 0}
+        ordered = sorted(self._samples)
+        return {
+            "count": len(ordered),
+            "last": round(self._samples[-1], 2),
+            "min": round(ordered[0], 2),
+            "p50": round(ordered[len(ordered) // 2], 2),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            "max": round(ordered[-1], 2),
+        }
+
+
+def classify_error(err: BaseException) -> str:
+    """Return the failure category of a refresh error."""
+    if isinstance(err, TimeoutError):
+        return "timeout"
+    if isinstance(err, (aiohttp.ClientConnectorCertificateError, aiohttp.ClientSSLError)):
+        return "tls"
+    if isinstance(err, aiohttp.ClientConnectorError):
+        # Les erreurs de résolution DNS remontent comme des erreurs de connexion
+        return "dns" if isinstance(err.os_error, socket.gaierror) else "connect"
+    if isinstance(err, aiohttp.ClientError):
+        return "http"
+    if isinstance(err, ValueError):
+        return "parse"
+    return "status"
+
+
+class RefreshMetrics:
+    """Metrics shared by the client, the store and the coordinators."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.phases = {phase: RollingHistogram() for phase in PHASES}
+        self.bytes_received = 0
+        self.requests = 0
+        self.connections_reused = 0
+        self.records_received = 0
+        self.records_kept = 0
+        self.last_error: dict[str, Any] | None = None
+        self.last_success: datetime | None = None
+        # Phase en cours, pour situer une éventuelle erreur
+        self.current = "request"
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Record the duration of one phase."""
+        self.phases[phase].add(seconds * 1000)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Time the enclosed block as the given phase."""
+        self.current = phase
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def record_error(self, err: BaseException) -> None:
+        """Remember the last failure and the phase it happened in."""
+        self.last_error = {
+            "phase": self.current,
+            "category": classify_error(err),
+            "type": type(err).__name__,
+            "message": str(err),
+            "at": dt_util.utcnow().isoformat(),
+        }
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return an aiohttp trace config feeding the DNS, connect and request phases."""
+        trace = aiohttp.TraceConfig(trace_config_ctx_factory=lambda trace_request_ctx: SimpleNamespace())
+
+        async def on_request_start(session, ctx, params) -> None:
+            ctx.start = time.perf_counter()
+            self.requests += 1
+            self.current = "request"
+
+        async def on_dns_start(session, ctx, params) -> None:
+            ctx.dns_start = time.perf_counter()
+            self.current = "dns"
+
+        async def on_dns_end(session, ctx, params) -> None:
+            self.add("dns", time.perf_counter() - ctx.dns_start)
+
+        async def on_connection_start(session, ctx, params) -> None:
+            ctx.connect_start = time.perf_counter()
+            self.current = "connect"
+
+        async def on_connection_end(session, ctx, params) -> None:
+            self.add("connect", time.perf_counter() - ctx.connect_start)
+            self.current = "request"
+
+        async def on_connection_reused(session, ctx, params) -> None:
+            self.connections_reused += 1
+
+        async def on_request_end(session, ctx, params) -> None:
+            # Jusqu'à la réception des en-têtes de réponse
+            self.add("request", time.perf_counter() - ctx.start)
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_dns_resolvehost_start.append(on_dns_start)
+        trace.on_dns_resolvehost_end.append(on_dns_end)
+        trace.on_connection_create_start.append(on_connection_start)
+        trace.on_connection_create_end.append(on_connection_end)
+        trace.on_connection_reuseconn.append(on_connection_reused)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a JSON-serializable dict."""
+        return {
+            "phases_ms": {phase: histogram.summary() for phase, histogram in self.phases.items()},
+            "requests": self.requests,
+            "connections_reused": self.connections_reused,
+            "bytes_received": self.bytes_received,
+            "records_received": self.records_received,
+            "records_kept": self.records_kept,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_error": self.last_error,
+        }
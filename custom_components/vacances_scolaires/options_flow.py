@@ -10,6 +10,8 @@ from .const import (
     CONF_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
     CONF_VERIFY_SSL,
+    CONF_POPULATION_ENTITIES,
+    CONF_ADAPTIVE_POLLING,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -57,6 +59,14 @@ class VacancesScolairesOptionsFlowHandler(OptionsFlow):
                         self.config_entry.data.get(CONF_VERIFY_SSL, True)
                     )
                 ): bool,
+                vol.Optional(
+                    CONF_POPULATION_ENTITIES,
+                    default=self.config_entry.options.get(CONF_POPULATION_ENTITIES, False)
+                ): bool,
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=self.config_entry.options.get(CONF_ADAPTIVE_POLLING, False)
+                ): bool,
             })
 
         )
@@ -1,15 +1,16 @@
 """Sensor platform for Vacances Scolaires."""
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from datetime import datetime, timedelta
 from typing import Any
-from .const import DOMAIN, CONF_LOCATION, CONF_ZONE, CONF_CONFIG_TYPE, ATTRIBUTION, ATTR_START_DATE, ATTR_END_DATE, ATTR_DESCRIPTION, ATTR_LOCATION, ATTR_ZONE, ATTR_ANNEE_SCOLAIRE, ATTR_EN_VACANCES
+from .const import DOMAIN, SIGNAL_METRICS_UPDATED, CONF_POPULATION_ENTITIES, POPULATION_NAMES, ATTRIBUTION, ATTR_LOCATION, ATTR_ZONE
 from .coordinator import VacancesScolairesDataUpdateCoordinator
+from .entity import VacancesScolairesEntity
 
 async def async_setup_entry(
     hass: HomeAssistant, 
@@ -22,169 +23,222 @@ async def async_setup_entry(
         [
             VacancesScolairesSensor(coordinator, entry),
             VacancesScolairesAujourdHuiSensor(coordinator, entry),
-            VacancesScolairesDemainSensor(coordinator, entry)
-        ],
-        True
+            VacancesScolairesDemainSensor(coordinator, entry),
+            *(
+                VacancesScolairesDiagnosticSensor(coordinator, entry, kind)
+                for kind in DIAGNOSTIC_SENSORS
+            ),
+            *(
+                VacancesScolairesCountdownSensor(coordinator, entry, kind)
+                for kind in COUNTDOWN_SENSORS
+            ),
+            *(
+                VacancesScolairesPopulationSensor(coordinator, entry, population)
+                for population in (POPULATION_NAMES if entry.options.get(CONF_POPULATION_ENTITIES) else ())
+            ),
+        ]
     )
 
-def convert_to_iso_format(date_str: str) -> str:
-    """Convertit une date au format '28 mai 2025 à 22:00:00 UTC' en format ISO '2025-05-28T22:00:00'."""
-    mois = {
-        "janvier": "01", "février": "02", "mars": "03", "avril": "04", "mai": "05", "juin": "06",
-        "juillet": "07", "août": "08", "septembre": "09", "octobre": "10", "novembre": "11", "décembre": "12"
-    }
-
-    # Extraire les parties de la date
-    parts = date_str.split(" ")
-    if len(parts) < 6:
-        # Valeur invalide
-        return ""
-
-    day, month_str, year, _, time_str, _ = parts
-
-    # Convertir le mois en chiffre
-    month = mois.get(month_str.lower(), "01")
-
-    # Créer la chaîne avec le format ISO attendu
-    iso_format_date = f"{year}-{month}-{day}T{time_str}"
+# Comptes à rebours : nom, unité, classe d'appareil
+COUNTDOWN_SENSORS = {
+    "next_start": ("Début prochaines vacances", None, SensorDeviceClass.TIMESTAMP),
+    "next_end": ("Fin prochaines vacances", None, SensorDeviceClass.TIMESTAMP),
+    "days_until": ("Jours avant vacances", UnitOfTime.DAYS, None),
+    "days_remaining": ("Jours de vacances restants", UnitOfTime.DAYS, None),
+    "school_year_progress": ("Avancement année scolaire", PERCENTAGE, None),
+}
+
+# Capteurs de diagnostic : nom, unité, classe d'appareil
+DIAGNOSTIC_SENSORS = {
+    "refresh_duration": ("Durée rafraîchissement", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION),
+    "bytes_received": ("Données reçues", UnitOfInformation.BYTES, SensorDeviceClass.DATA_SIZE),
+    "cache_hit_ratio": ("Taux de cache", PERCENTAGE, None),
+}
+
+class VacancesScolairesSensor(VacancesScolairesEntity, SensorEntity):
+    """Representation of a Vacances Scolaires sensor."""
 
-    return iso_format_date
+    # Libellés fixes de l'entrée : utiles dans l'état, inutiles dans l'historique
+    _unrecorded_attributes = frozenset({ATTR_LOCATION, ATTR_ZONE})
 
-class VacancesScolairesSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Vacances Scolaires sensor."""
+    _attr_attribution = ATTRIBUTION
 
     def __init__(self, coordinator: VacancesScolairesDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.entry = entry
-        config_type = entry.data.get(CONF_CONFIG_TYPE, "location")
-        if config_type == "location":
-            location = entry.data.get(CONF_LOCATION, "Unknown")
-            self._attr_unique_id = f"{DOMAIN}_{config_type}_{location}"
-            self._attr_name = f"Vacances Scolaires {location}"
-        else:
-            zone = entry.data.get(CONF_ZONE, "Unknown")
-            self._attr_unique_id = f"{DOMAIN}_{config_type}_{zone}"
-            self._attr_name = f"Vacances Scolaires {zone}"
-        self._attr_attribution = ATTRIBUTION
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{DOMAIN}_{self.config_type}_{self.target}"
+        self._attr_name = f"Vacances Scolaires {self.target}"
 
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        return self.coordinator.data.get("state") if self.coordinator.data else None
+        view = self.view
+        return view.state if view else None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        if self.coordinator.data:
-            return {
-                ATTR_START_DATE: self.coordinator.data.get("start_date"),
-                ATTR_END_DATE: self.coordinator.data.get("end_date"),
-                ATTR_DESCRIPTION: self.coordinator.data.get("description"),
-                ATTR_LOCATION: self.coordinator.data.get("location"),
-                ATTR_ZONE: self.coordinator.data.get("zone"),
-                ATTR_ANNEE_SCOLAIRE: self.coordinator.data.get("année_scolaire"),
-                ATTR_EN_VACANCES: self.coordinator.data.get("on_vacation")
-            }
-        return {}
-
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self.entry.entry_id)},
-            "name": "Vacances Scolaires",
-            "manufacturer": "Master13011",
-            "model": "API",
-        }
+        view = self.view
+        return view.attributes if view else {}
 
-class VacancesScolairesAujourdHuiSensor(CoordinatorEntity, SensorEntity):
+class VacancesScolairesAujourdHuiSensor(VacancesScolairesEntity, SensorEntity):
     """Sensor for 'Are we on vacation today?'."""
-    
+
+    _attr_attribution = ATTRIBUTION
+
     def __init__(self, coordinator: VacancesScolairesDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.entry = entry
-        config_type = entry.data.get(CONF_CONFIG_TYPE, "location")
-        if config_type == "location":
-            location = entry.data.get(CONF_LOCATION, "Unknown")
-            self._attr_unique_id = f"{DOMAIN}_{config_type}_{location}_today"
-            self._attr_name = f"Vacances Scolaires Aujourd'hui {location}"
-        else:
-            zone = entry.data.get(CONF_ZONE, "Unknown")
-            self._attr_unique_id = f"{DOMAIN}_{config_type}_{zone}_today"
-            self._attr_name = f"Vacances Scolaires Aujourd'hui {zone}"
-        self._attr_attribution = ATTRIBUTION        
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{DOMAIN}_{self.config_type}_{self.target}_today"
+        self._attr_name = f"Vacances Scolaires Aujourd'hui {self.target}"
 
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-
-        start_date_str = self.coordinator.data.get("start_date")
-        end_date_str = self.coordinator.data.get("end_date")
-        if not isinstance(start_date_str, str) or not isinstance(end_date_str, str):
-            return None
-
-        start_date = datetime.fromisoformat(convert_to_iso_format(start_date_str))
-        end_date = datetime.fromisoformat(convert_to_iso_format(end_date_str))
-
-        today = datetime.now()
-        if start_date <= today <= end_date:
-            return "En vacances"
-        return "Pas en vacances"
-        
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self.entry.entry_id)},
-            "name": "Vacances Scolaires",
-            "manufacturer": "Master13011",
-            "model": "API",
-        }
+        view = self.view
+        return view.today if view else None
 
-class VacancesScolairesDemainSensor(CoordinatorEntity, SensorEntity):
+class VacancesScolairesDemainSensor(VacancesScolairesEntity, SensorEntity):
     """Sensor for 'Are we on vacation tomorrow?'."""
-    
+
+    _attr_attribution = ATTRIBUTION
+
     def __init__(self, coordinator: VacancesScolairesDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.entry = entry
-        config_type = entry.data.get(CONF_CONFIG_TYPE, "location")
-        if config_type == "location":
-            location = entry.data.get(CONF_LOCATION, "Unknown")
-            self._attr_unique_id = f"{DOMAIN}_{config_type}_{location}_tomorrow"
-            self._attr_name = f"Vacances Scolaires Demain {location}"
-        else:
-            zone = entry.data.get(CONF_ZONE, "Unknown")
-            self._attr_unique_id = f"{DOMAIN}_{config_type}_{zone}_tomorrow"
-            self._attr_name = f"Vacances Scolaires Demain {zone}"
-        self._attr_attribution = ATTRIBUTION   
-        
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{DOMAIN}_{self.config_type}_{self.target}_tomorrow"
+        self._attr_name = f"Vacances Scolaires Demain {self.target}"
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the state of the sensor."""
+        view = self.view
+        return view.tomorrow if view else None
+
+class VacancesScolairesCountdownSensor(VacancesScolairesEntity, SensorEntity):
+    """Countdown to or within the vacations, read from the snapshot.
+
+    Les valeurs sont calculées par le coordinateur au minuit local de la zone :
+    lire l'état ne refait aucun calcul de dates.
+    """
+
+    _attr_attribution = ATTRIBUTION
+
+    def __init__(self, coordinator: VacancesScolairesDataUpdateCoordinator, entry: ConfigEntry, kind: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry)
+        self.kind = kind
+        label, unit, device_class = COUNTDOWN_SENSORS[kind]
+        self._attr_unique_id = f"{DOMAIN}_{self.config_type}_{self.target}_{kind}"
+        self._attr_name = f"Vacances Scolaires {label} {self.target}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        if unit is not None:
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        view = self.view
+        return getattr(view.data, self.kind) if view else None
+
+class VacancesScolairesPopulationSensor(VacancesScolairesEntity, SensorEntity):
+    """Sensor for 'Are we on vacation today?' for one population (élèves, enseignants)."""
+
+    _attr_attribution = ATTRIBUTION
+
+    def __init__(
+        self, coordinator: VacancesScolairesDataUpdateCoordinator, entry: ConfigEntry, population: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry)
+        self.population = population
+        self._attr_unique_id = f"{DOMAIN}_{self.config_type}_{self.target}_{population}"
+        self._attr_name = f"Vacances Scolaires {POPULATION_NAMES[population]} {self.target}"
+
+    @property
+    def available(self) -> bool:
+        """Return False when the dataset has no series for this population."""
+        view = self.view
+        return super().available and view is not None and self.population in view.populations
+
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
+        return self.view.populations[self.population][0]
 
-        start_date_str = self.coordinator.data.get("start_date")
-        end_date_str = self.coordinator.data.get("end_date")
-        if not isinstance(start_date_str, str) or not isinstance(end_date_str, str):
-            return None
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the current or next period of this population."""
+        return self.view.populations[self.population][1]
+
+class VacancesScolairesDiagnosticSensor(VacancesScolairesEntity, SensorEntity):
+    """Refresh-path metric, disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    # Détail des mesures : consultable dans l'état, trop volumineux pour le recorder
+    _unrecorded_attributes = frozenset(
+        {"phases_ms", "last_error", "requests", "connections_reused", "records_received", "records_kept",
+         "freshness_hits", "validation_hits", "validation_misses"}
+    )
 
-        start_date = datetime.fromisoformat(convert_to_iso_format(start_date_str))
-        end_date = datetime.fromisoformat(convert_to_iso_format(end_date_str))
+    def __init__(self, coordinator: VacancesScolairesDataUpdateCoordinator, entry: ConfigEntry, kind: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry)
+        self.kind = kind
+        label, unit, device_class = DIAGNOSTIC_SENSORS[kind]
+        self._attr_unique_id = f"{DOMAIN}_{self.config_type}_{self.target}_{kind}"
+        self._attr_name = f"Vacances Scolaires {label} {self.target}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        if kind == "bytes_received":
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    async def async_added_to_hass(self) -> None:
+        """Also refresh on every fetch attempt, even when the data is unchanged."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, SIGNAL_METRICS_UPDATED, self._handle_metrics_update)
+        )
+
+    @callback
+    def _handle_metrics_update(self) -> None:
+        self.async_write_ha_state_if_changed()
 
-        tomorrow = datetime.now() + timedelta(days=1)
-        if start_date <= tomorrow <= end_date:
-            return "En vacances"
-        return "Pas en vacances"
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the sensor."""
+        store = self.coordinator.store
+        metrics = store.client.metrics
+        if self.kind == "refresh_duration":
+            last = metrics.phases["total"].last
+            return round(last, 1) if last is not None else None
+        if self.kind == "bytes_received":
+            return metrics.bytes_received
+        ratio = store.cache_hit_ratio
+        return round(ratio * 100, 1) if ratio is not None else None
 
     @property
-    def device_info(self):
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        metrics = self.coordinator.store.client.metrics
+        if self.kind == "refresh_duration":
+            return {
+                "phases_ms": {phase: histogram.summary() for phase, histogram in metrics.phases.items()},
+                "last_error": metrics.last_error,
+            }
+        if self.kind == "bytes_received":
+            return {
+                "requests": metrics.requests,
+                "connections_reused": metrics.connections_reused,
+                "records_received": metrics.records_received,
+                "records_kept": metrics.records_kept,
+            }
+        store = self.coordinator.store
         return {
-            "identifiers": {(DOMAIN, self.entry.entry_id)},
-            "name": "Vacances Scolaires",
-            "manufacturer": "Master13011",
-            "model": "API",
+            "freshness_hits": store.freshness_hits,
+            "validation_hits": store.validation_hits,
+            "validation_misses": store.validation_misses,
         }
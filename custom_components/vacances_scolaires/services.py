@@ -0,0 +1,140 @@
+"""Services of the Vacances Scolaires integration."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_STORE, DOMAIN
+from .coordinator import async_get_indexes
+from .index import VacationIndex, VacationPeriod
+from .store import school_year_start
+from .util import get_timezone
+
+SERVICE_QUERY = "query"
+
+ATTR_DATES = "dates"
+ATTR_START = "start_date"
+ATTR_END = "end_date"
+ATTR_ZONES = "zones"
+ATTR_LOCATIONS = "locations"
+
+# Borne la taille de la réponse : trois années scolaires de dates
+MAX_QUERY_DAYS = 3 * 366
+
+QUERY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_DATES): vol.All(cv.ensure_list, [cv.date]),
+            vol.Inclusive(ATTR_START, "range"): cv.date,
+            vol.Inclusive(ATTR_END, "range"): cv.date,
+            vol.Optional(ATTR_ZONES): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_LOCATIONS): vol.All(cv.ensure_list, [cv.string]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DATES, ATTR_START),
+    cv.has_at_least_one_key(ATTR_ZONES, ATTR_LOCATIONS),
+)
+
+
+def _query_days(call: ServiceCall) -> list[date]:
+    """Return the distinct requested days, in order."""
+    days = set(call.data.get(ATTR_DATES, []))
+    if ATTR_START in call.data:
+        start, end = call.data[ATTR_START], call.data[ATTR_END]
+        if end < start:
+            raise ServiceValidationError(f"{ATTR_END} must not be before {ATTR_START}")
+        if (end - start).days >= MAX_QUERY_DAYS:
+            raise ServiceValidationError(f"At most {MAX_QUERY_DAYS} days can be queried at once")
+        days.update(start + timedelta(days=offset) for offset in range((end - start).days + 1))
+    if len(days) > MAX_QUERY_DAYS:
+        raise ServiceValidationError(f"At most {MAX_QUERY_DAYS} days can be queried at once")
+    return sorted(days)
+
+
+async def _async_get_index(hass: HomeAssistant, field: str, value: str) -> VacationIndex | None:
+    """Return the period index of a zone or location from the data in memory."""
+    store = hass.data.get(DATA_STORE)
+    timezone = get_timezone(value)
+    target = (field, value)
+    if field == "location" and store is not None and (resolved := store.resolve_location(value)) is not None:
+        value, zone, timezone = resolved
+        target = ("zones", zone)
+
+    # Index déjà construit par une entrée configurée pour cette zone/localisation
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if coordinator.slice_key == (field, value) and coordinator.data:
+            return coordinator.data.periods
+
+    # Sinon, tranche du calendrier partagé s'il la contient
+    if store is None or not (store.covers(*target) or store.covers(field, value)):
+        return None
+    # Index mis en cache par le calendrier partagé, construit dans l'exécuteur au besoin
+    index, _ = await async_get_indexes(hass, store, field, value, dt_util.get_time_zone(timezone))
+    return index or None
+
+
+def _period_metadata(period: VacationPeriod) -> dict[str, Any]:
+    """Return the JSON-serializable description of a period."""
+    return {
+        "description": period.description,
+        "start": period.start.isoformat(),
+        "end": period.end.isoformat(),
+        "zone": period.zone,
+        "location": period.location,
+        "annee_scolaire": period.annee_scolaire,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_query(call: ServiceCall) -> ServiceResponse:
+        """Answer holiday/work for every requested day and zone/location, from local data only."""
+        days = _query_days(call)
+        targets = [("zones", zone) for zone in call.data.get(ATTR_ZONES, [])]
+        targets += [("location", location) for location in call.data.get(ATTR_LOCATIONS, [])]
+
+        matrix: dict[str, dict[str, str]] = {}
+        period_ids: dict[str, dict[str, int]] = {}
+        periods: list[dict[str, Any]] = []
+        known: dict[VacationPeriod, int] = {}
+        keys = [day.isoformat() for day in days]
+        for field, requested in targets:
+            index = await _async_get_index(hass, field, requested)
+            if index is None:
+                raise ServiceValidationError(
+                    f"No calendar data loaded for {requested}; configure an entry for it or one in its zone"
+                )
+            # Couverture : de la rentrée de la première année connue à la fin des dernières vacances
+            first, last = school_year_start(index.first_day()), index.last_day()
+            row: dict[str, str] = {}
+            ids: dict[str, int] = {}
+            for key, day, period in zip(keys, days, index.periods_at(days)):
+                if period is not None:
+                    if period not in known:
+                        known[period] = len(periods)
+                        periods.append(_period_metadata(period))
+                    ids[key] = known[period]
+                    row[key] = "holidays"
+                elif day < first or day >= last:
+                    # Hors des années scolaires publiées : on ne sait pas
+                    row[key] = "unknown"
+                else:
+                    row[key] = "work"
+            # Clés telles que saisies (« lyon ») et non le nom résolu (« Lyon ») : les modèles les retrouvent
+            matrix[requested] = row
+            period_ids[requested] = ids
+
+        return {"dates": keys, "matrix": matrix, "period_ids": period_ids, "periods": periods}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_QUERY, async_query, schema=QUERY_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
@@ -0,0 +1,647 @@
+"""Dataset-wide school calendar store shared by every config entry."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta
+from functools import partial
+import logging
+import sys
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .api import (
+    REQUEST_ERRORS,
+    CircuitOpenError,
+    RetryableStatusError,
+    VacancesScolairesApiClient,
+    VacancesScolairesApiError,
+    async_get_client,
+)
+from .baseline import Baseline, load_baseline, merge_records, targets_of
+from .const import (
+    ADAPTIVE_COVERED_MAX,
+    ADAPTIVE_COVERED_MIN,
+    ADAPTIVE_PENDING_MAX,
+    CACHE_TTL,
+    DATA_STORE,
+    DOMAIN,
+    SIGNAL_METRICS_UPDATED,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .util import get_timezone, normalize_location
+
+_LOGGER = logging.getLogger(__name__)
+
+# Taille de page maximale acceptée par l'API Opendatasoft
+PAGE_SIZE = 100
+
+# Modes d'ingestion : export complet en flux, ou API records paginée
+INGEST_EXPORT = "export"
+INGEST_RECORDS = "records"
+
+# Colonnes utiles de l'export
+EXPORT_FIELDS = "description,population,start_date,end_date,location,zones,annee_scolaire"
+
+# Lignes d'export décodées et filtrées par tâche de l'exécuteur
+EXPORT_BATCH = 2000
+
+# Requête des métadonnées du jeu de données (date de dernière modification)
+METADATA_PARAMS = {"select": "metas"}
+
+# Délai de regroupement des écritures du cache disque (secondes)
+SAVE_DELAY = 10
+
+# Entrées notifiées entre deux passages de la boucle lors d'une diffusion
+FANOUT_BATCH = 50
+
+# Champs répétés d'un enregistrement à l'autre, partagés en mémoire
+INTERNED_FIELDS = ("description", "population", "location", "zones", "annee_scolaire")
+
+
+def _intern_record(record: dict[str, Any]) -> dict[str, Any]:
+    """Share the repeated strings of a record between all records."""
+    for field in INTERNED_FIELDS:
+        value = record.get(field)
+        if type(value) is str:
+            record[field] = sys.intern(value)
+    return record
+
+
+def _decode_export_lines(
+    lines: list[bytes], zones: set[str], locations: set[str], cutoff: str
+) -> tuple[list[dict[str, Any]], dict[str, str], float, float]:
+    """Decode and filter a batch of export lines, in the executor.
+
+    Return the kept rows, the location → zone pairs seen, and the decoding and
+    filtering times.
+    """
+    kept: list[dict[str, Any]] = []
+    seen: dict[str, str] = {}
+    start = time.perf_counter()
+    rows = [json_loads(line) for line in lines]
+    decoded = time.perf_counter()
+    for row in rows:
+        location = row.get("location")
+        if location not in seen:
+            seen[location] = row.get("zones")
+        # Filtrage : date puis zone/localisation, toutes populations gardées
+        if (row.get("end_date") or "")[:10] >= cutoff and (
+            row.get("zones") in zones or location in locations
+        ):
+            kept.append(_intern_record(row))
+    return kept, seen, decoded - start, time.perf_counter() - decoded
+
+
+def next_poll_interval(coverage_end: date | None, today: date, unchanged: int, base: timedelta) -> timedelta:
+    """Return the delay before the next refresh of an entry with adaptive polling.
+
+    Tant que l'année scolaire suivante n'est pas publiée, on reste proche de
+    l'intervalle configuré pour la récupérer vite ; ensuite le jeu de données ne
+    change que quelques fois par an.
+    """
+    # Les grandes vacances de l'année suivante se terminent après le 1er août de l'année d'après
+    following_published = date(school_year_start(today).year + 2, 8, 1)
+    if coverage_end is not None and coverage_end >= following_published:
+        floor, cap = timedelta(hours=ADAPTIVE_COVERED_MIN), timedelta(hours=ADAPTIVE_COVERED_MAX)
+    else:
+        floor, cap = base, timedelta(hours=ADAPTIVE_PENDING_MAX)
+    # Backoff exponentiel sur les résultats inchangés (exposant borné)
+    return min(floor * 2 ** min(unchanged, 10), max(cap, floor))
+
+
+def school_year_start(today: date) -> date:
+    """Return the first day of the school year containing the given day."""
+    year = today.year if today.month >= 8 else today.year - 1
+    return date(year, 8, 1)
+
+
+def _quote(value: str) -> str:
+    """Quote a string literal for an ODSQL where clause."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class VacancesScolairesCalendarStore:
+    """Fetch the calendar once per cycle for all zones and locations."""
+
+    def __init__(self, hass: HomeAssistant, client: VacancesScolairesApiClient) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.client = client
+        self.records: list[dict[str, Any]] = []
+        self.fetched_at: datetime | None = None
+        self._fetched_targets: frozenset[tuple[str, str]] = frozenset()
+        # Zones/localisations présentes en mémoire, téléchargées ou non depuis la dernière modification
+        self._available: frozenset[tuple[str, str]] = frozenset()
+        self._targets: dict[str, tuple[str, str]] = {}
+        # Nombre d'entrées par cible : évite de reparcourir toutes les entrées à chaque appel
+        self._target_counts: dict[tuple[str, str], int] = {}
+        # Mode grande échelle : un seul minuteur de rafraîchissement pour toutes les entrées
+        # Par entrée : (intervalle configuré, sondage adaptatif)
+        self._poll_entries: dict[str, tuple[timedelta, bool]] = {}
+        self._last_poll = dt_util.utcnow()
+        self._next_poll: datetime | None = None
+        # Dernier jour de vacances connu par cible, recalculé à chaque remplacement des enregistrements
+        self._coverage: dict[tuple[str, str], date] | None = None
+        self._unsub_poll: CALLBACK_TYPE | None = None
+        # Revalidations consécutives sans changement, pour le sondage adaptatif
+        self.unchanged_polls = 0
+        # Index construits par les coordinateurs, partagés entre entrées de même tranche
+        self.index_cache: dict[Any, Any] = {}
+        # Incrémenté à chaque remplacement des enregistrements : un index construit
+        # entre-temps à partir des anciens n'est pas mis en cache
+        self.records_generation = 0
+        self._verify_ssl: dict[str, bool] = {}
+        self._listeners: dict[str, Callable[[], None]] = {}
+        self._lock = asyncio.Lock()
+        # Téléchargements en cours : clé de requête -> (tâche, entrées en attente)
+        self._inflight: dict[tuple[frozenset[tuple[str, str]], date], tuple[asyncio.Task[bool], set[str]]] = {}
+        self.ttl = timedelta(seconds=CACHE_TTL)
+        self._storage: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._loaded = False
+        self.ingestion_mode = INGEST_EXPORT
+        # Date de mise à jour du jeu de données (métadonnées du catalogue)
+        self.dataset_modified: str | None = None
+        self.validation_hits = 0
+        self.validation_misses = 0
+        self.freshness_hits = 0
+        # Index des localisations : nom normalisé -> (localisation, zone)
+        self.locations: dict[str, tuple[str, str]] = {}
+
+    async def async_load(self) -> None:
+        """Load the last good dataset from disk, once."""
+        async with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            cached = await self._storage.async_load()
+            fetched_at = dt_util.parse_datetime((cached or {}).get("fetched_at") or "")
+            if fetched_at is None:
+                # Première installation ou sauvegarde sans cache : instantané embarqué
+                await self._async_load_baseline()
+                return
+            self._set_records([_intern_record(record) for record in cached.get("records") or []])
+            self.ttl = timedelta(seconds=cached.get("ttl", CACHE_TTL))
+            self.dataset_modified = cached.get("dataset_modified")
+            if not cached.get("all_populations"):
+                # Cache d'une version qui ne gardait que les élèves : servi, mais retéléchargé au plus tôt
+                fetched_at -= self.ttl
+                self.dataset_modified = None
+            self.fetched_at = fetched_at
+            self._fetched_targets = frozenset(tuple(target) for target in cached.get("targets", []))
+            self._set_locations(cached.get("locations") or [])
+            self.unchanged_polls = cached.get("unchanged_polls", 0)
+            _LOGGER.debug(f"Cache chargé : {len(self.records)} périodes du {fetched_at.isoformat()}")
+
+    def _set_records(self, records: list[dict[str, Any]]) -> None:
+        """Replace the records in memory and invalidate what was derived from them."""
+        self.records = records
+        self._available = targets_of(records)
+        self.records_generation += 1
+        self.index_cache.clear()
+        self._coverage = None
+
+    async def _async_load_baseline(self) -> None:
+        """Serve the baseline bundled with the integration until the API answers."""
+        baseline = await self.hass.async_add_executor_job(self._read_baseline)
+        fetched_at = dt_util.parse_datetime(baseline.built_at) if baseline else None
+        if fetched_at is None:
+            return
+        self._set_records(baseline.records)
+        self._fetched_targets = self._available
+        # Ancien : revalidé dès le démarrage, sans téléchargement si le jeu de données n'a pas changé
+        self.fetched_at = fetched_at
+        self.dataset_modified = baseline.dataset_modified
+        self._set_locations((record["location"], record.get("zones")) for record in self.records)
+        _LOGGER.debug(f"Instantané embarqué chargé : {len(self.records)} périodes du {baseline.built_at}")
+
+    @staticmethod
+    def _read_baseline() -> Baseline | None:
+        """Read the baseline and keep the school years not over yet, in the executor."""
+        baseline = load_baseline()
+        if baseline is None:
+            return None
+        cutoff = school_year_start(date.today()).isoformat()
+        records = [
+            _intern_record(record) for record in baseline.records if (record.get("end_date") or "")[:10] >= cutoff
+        ]
+        return Baseline(baseline.built_at, baseline.dataset_modified, records)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the payload written to disk."""
+        return {
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "ttl": int(self.ttl.total_seconds()),
+            "dataset_modified": self.dataset_modified,
+            "all_populations": True,
+            "unchanged_polls": self.unchanged_polls,
+            "targets": sorted(self._fetched_targets),
+            "locations": sorted(set(self.locations.values())),
+            "records": self.records,
+        }
+
+    async def async_flush(self) -> None:
+        """Write the dataset to disk now instead of waiting for the delayed save."""
+        if self.fetched_at is not None:
+            await self._storage.async_save(self._data_to_save())
+
+    @callback
+    def async_register(
+        self,
+        entry_id: str,
+        field: str,
+        value: str,
+        verify_ssl: bool,
+        listener: Callable[[], None],
+        poll_interval: timedelta | None = None,
+        adaptive: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Register the slice of an entry; return a callback to unregister it.
+
+        With a poll_interval the store refreshes on behalf of the entry, on one
+        timer shared by every such entry, instead of the entry's own timer;
+        adaptive entries stretch that interval with next_poll_interval.
+        """
+        target = (field, value)
+        self._targets[entry_id] = target
+        self._target_counts[target] = self._target_counts.get(target, 0) + 1
+        self._verify_ssl[entry_id] = verify_ssl
+        self._listeners[entry_id] = listener
+        if poll_interval is not None:
+            self._poll_entries[entry_id] = (poll_interval, adaptive)
+            # Seul le délai de cette entrée est calculé : l'inscription reste en O(1)
+            self._async_schedule_poll(self._entry_poll_delay(entry_id, dt_util.now().date()))
+
+        return partial(self.async_unregister, entry_id)
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Forget the slice and listener of an entry; calling it again does nothing."""
+        target = self._targets.pop(entry_id, None)
+        if target is not None:
+            self._target_counts[target] -= 1
+            if not self._target_counts[target]:
+                del self._target_counts[target]
+        self._verify_ssl.pop(entry_id, None)
+        self._listeners.pop(entry_id, None)
+        if self._poll_entries.pop(entry_id, None) is not None and not self._poll_entries:
+            self._async_schedule_poll(None)
+        # Sinon le minuteur reste armé : au pire un sondage en avance, qui recalcule le délai
+
+    def _coverage_ends(self) -> dict[tuple[str, str], date]:
+        """Return the last vacation day known for each zone and location."""
+        if self._coverage is None:
+            ends: dict[tuple[str, str], str] = {}
+            for record in self.records:
+                end = (record.get("end_date") or "")[:10]
+                for target in (("zones", record.get("zones")), ("location", record.get("location"))):
+                    if end > ends.get(target, ""):
+                        ends[target] = end
+            self._coverage = {target: date.fromisoformat(end) for target, end in ends.items()}
+        return self._coverage
+
+    def _entry_poll_delay(self, entry_id: str, today: date) -> timedelta:
+        """Return the delay wanted by one polled entry."""
+        base, adaptive = self._poll_entries[entry_id]
+        if not adaptive:
+            return base
+        coverage = self._coverage_ends().get(self._targets[entry_id])
+        return next_poll_interval(coverage, today, self.unchanged_polls, base)
+
+    def _poll_delay(self) -> timedelta | None:
+        """Return the shortest delay wanted by the polled entries."""
+        today = dt_util.now().date()
+        return min((self._entry_poll_delay(entry_id, today) for entry_id in self._poll_entries), default=None)
+
+    @callback
+    def _async_schedule_poll(self, delay: timedelta | None, reschedule: bool = False) -> None:
+        """Arm the shared refresh timer after the given delay since the last poll.
+
+        Le minuteur n'est avancé que si ce délai tombe plus tôt, sauf avec
+        reschedule=True (après un sondage, délai recalculé sur toutes les entrées).
+        """
+        when = None if delay is None else max(self._last_poll + delay, dt_util.utcnow())
+        if when == self._next_poll:
+            return
+        if not reschedule and when is not None and self._next_poll is not None and when > self._next_poll:
+            return
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+        self._next_poll = when
+        if when is not None:
+            self._unsub_poll = async_track_point_in_utc_time(self.hass, self._async_poll, when)
+
+    @callback
+    def _async_poll(self, now: datetime) -> None:
+        """Refresh the dataset for every polled entry at once."""
+        self._unsub_poll = self._next_poll = None
+        self.hass.async_create_background_task(self._async_poll_refresh(), f"{DOMAIN}_shared_refresh")
+
+    async def _async_poll_refresh(self) -> None:
+        if not self._poll_entries:
+            return
+        # Fraîcheur jugée sur le plus court intervalle configuré, comme une entrée seule
+        max_age = min(base for base, _ in self._poll_entries.values()) / 2
+        # Aucune entrée en attente : toutes sont notifiées en cas de nouvelles données
+        try:
+            await self.async_fetch("", max_age)
+        except REQUEST_ERRORS as err:
+            _LOGGER.warning(f"Rafraîchissement commun impossible, données en cache conservées : {err!r}")
+        finally:
+            self._last_poll = dt_util.utcnow()
+            self._async_schedule_poll(self._poll_delay(), reschedule=True)
+
+    def is_fresh(self, max_age: timedelta | None = None) -> bool:
+        """Return True if the cached records cover every target and are recent enough."""
+        if max_age is None:
+            max_age = self.ttl
+        if self.fetched_at is None:
+            return False
+        if not self._target_counts.keys() <= self._fetched_targets:
+            return False
+        return dt_util.utcnow() - self.fetched_at < max_age
+
+    def _set_locations(self, pairs: Iterable[tuple[str, str]]) -> None:
+        """Rebuild the location index from (location, zone) pairs."""
+        self.locations = {normalize_location(location): (location, zone) for location, zone in pairs if location and zone}
+
+    @callback
+    def resolve_location(self, location: str) -> tuple[str, str, str] | None:
+        """Return the dataset name, zone and timezone of a location typed by the user."""
+        found = self.locations.get(normalize_location(location))
+        if found is None:
+            return None
+        name, zone = found
+        return name, zone, get_timezone(zone)
+
+    async def async_load_locations(self, verify_ssl: bool = True, persist: bool = True) -> None:
+        """Fill the location index from the API if no download filled it yet.
+
+        With persist=False the index is not written to the disk cache.
+        """
+        if self.locations:
+            return
+        data = await self.client.async_get_json(
+            "records",
+            {"select": "location, zones", "group_by": "location, zones", "limit": PAGE_SIZE},
+            verify_ssl=verify_ssl,
+        )
+        self._set_locations((row.get("location"), row.get("zones")) for row in data.get("results") or [])
+        if persist:
+            self._storage.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_fetch(self, entry_id: str, max_age: timedelta) -> bool:
+        """Refresh the dataset unless it is still fresh, then notify the other entries.
+
+        Les appels concurrents pour la même requête (mêmes zones/localisations,
+        même date de coupure) attendent un seul téléchargement en cours.
+        Return True if new records were downloaded.
+        """
+        if self.is_fresh(max_age):
+            self.freshness_hits += 1
+            return False
+
+        targets = frozenset(self._target_counts)
+        key = (targets, school_year_start(date.today()))
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            waiters: set[str] = set()
+            task = self.hass.async_create_background_task(
+                self._async_refresh(targets, waiters), f"{DOMAIN}_fetch_calendar"
+            )
+            inflight = self._inflight[key] = (task, waiters)
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        task, waiters = inflight
+        waiters.add(entry_id)
+        # shield : un appelant annulé (rechargement d'entrée) n'interrompt pas le téléchargement
+        return await asyncio.shield(task)
+
+    async def _async_refresh(self, targets: frozenset[tuple[str, str]], waiters: set[str]) -> bool:
+        """Run one revalidation and notify the entries that are not waiting for it."""
+        requested_at = dt_util.utcnow()
+        async with self._lock:
+            # Un autre téléchargement a pu couvrir ces cibles pendant l'attente du verrou
+            if (
+                self.fetched_at is not None
+                and self.fetched_at >= requested_at
+                and targets <= self._fetched_targets
+            ):
+                return False
+            metrics = self.client.metrics
+            start = time.perf_counter()
+            try:
+                changed = await self._async_revalidate(targets)
+            except Exception as err:
+                metrics.record_error(err)
+                raise
+            else:
+                metrics.last_success = dt_util.utcnow()
+            finally:
+                metrics.add("total", time.perf_counter() - start)
+                async_dispatcher_send(self.hass, SIGNAL_METRICS_UPDATED)
+            # Compteur du backoff adaptatif : seules les revalidations effectives comptent
+            self.unchanged_polls = 0 if changed else self.unchanged_polls + 1
+            if not changed:
+                return False
+
+        # Toutes les entrées basculent sur les nouvelles données, par lots pour ne pas bloquer la boucle
+        pending = [listener for other_id, listener in self._listeners.items() if other_id not in waiters]
+        for start in range(0, len(pending), FANOUT_BATCH):
+            if start:
+                await asyncio.sleep(0)
+            for listener in pending[start:start + FANOUT_BATCH]:
+                listener()
+        return True
+
+    async def async_wait_idle(self) -> None:
+        """Wait for the running downloads, ignoring their errors."""
+        tasks = [task for task, _ in self._inflight.values()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _async_revalidate(self, targets: frozenset[tuple[str, str]]) -> bool:
+        """Download the records only if the dataset changed upstream."""
+        modified = None
+        if self.fetched_at is not None and targets <= self._fetched_targets:
+            # API en panne : l'erreur remonte et le coordinateur sert le cache, sans tenter le téléchargement
+            metadata = await self.client.async_get_json(
+                "", METADATA_PARAMS, verify_ssl=self._verify_ssl_all, conditional=True
+            )
+            if metadata is not None:
+                metas = (metadata.get("metas") or {}).get("default") or {}
+                modified = metas.get("data_processed") or metas.get("modified")
+            if metadata is None or (modified is not None and modified == self.dataset_modified):
+                # 304 ou jeu de données inchangé : rien à télécharger ni à analyser
+                self.validation_hits += 1
+                self.fetched_at = dt_util.utcnow()
+                self._storage.async_delay_save(self._data_to_save, SAVE_DELAY)
+                return False
+
+        try:
+            changed = await self._async_fetch_records(targets)
+        except BaseException:
+            # Sans cela, la prochaine 304 passerait pour « inchangé » et le téléchargement raté ne serait jamais refait
+            self.client.discard_validators("", METADATA_PARAMS)
+            raise
+        self.validation_misses += 1
+        if modified is not None:
+            self.dataset_modified = modified
+        return changed
+
+    @property
+    def _verify_ssl_all(self) -> bool:
+        """Return the SSL policy of the shared requests."""
+        # Une seule entrée sans vérification SSL suffit à la désactiver pour la requête commune
+        return all(self._verify_ssl.values())
+
+    async def _async_fetch_records(self, targets: frozenset[tuple[str, str]]) -> bool:
+        """Download every record of the given zones and locations, and merge them in.
+
+        Return True if the merge changed the records in memory.
+        """
+        if not targets:
+            return False
+
+        cutoff = school_year_start(date.today())
+        if self.ingestion_mode == INGEST_EXPORT:
+            try:
+                records = await self._async_ingest_export(targets, cutoff)
+            except (CircuitOpenError, RetryableStatusError):
+                # Panne de l'API, pas de l'export : l'API records échouerait de même
+                raise
+            except VacancesScolairesApiError as err:
+                # Export indisponible : on repasse par l'API paginée
+                _LOGGER.debug(f"Export indisponible ({err}), bascule sur l'API records")
+                records = await self._async_ingest_records(targets, cutoff)
+        else:
+            records = await self._async_ingest_records(targets, cutoff)
+
+        _LOGGER.debug(f"{len(records)} périodes récupérées pour {len(targets)} zone(s)/localisation(s)")
+        # Seules les années scolaires nouvelles ou modifiées remplacent celles en mémoire
+        merged, changed = await self.hass.async_add_executor_job(
+            merge_records, self.records, records, cutoff.isoformat()
+        )
+        if changed:
+            self._set_records(merged)
+        self.fetched_at = dt_util.utcnow()
+        self._fetched_targets = targets
+        self._storage.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return changed
+
+    async def _async_ingest_export(
+        self, targets: frozenset[tuple[str, str]], cutoff: date
+    ) -> list[dict[str, Any]]:
+        """Stream the whole dataset export and keep only the rows we need."""
+        zones = {value for field, value in targets if field == "zones"}
+        locations = {value for field, value in targets if field == "location"}
+        cutoff_str = cutoff.isoformat()
+
+        records: list[dict[str, Any]] = []
+        # Toutes les localisations du jeu de données, pour l'index, sans coût réseau supplémentaire
+        seen: dict[str, str] = {}
+        rows = 0
+        metrics = self.client.metrics
+        decode_time = filter_time = 0.0
+        batch: list[bytes] = []
+
+        async def _flush() -> None:
+            nonlocal decode_time, filter_time
+            metrics.current = "json_decode"
+            # Décodage et filtrage par lots dans l'exécuteur : la boucle ne fait que lire le flux
+            kept, batch_seen, decoding, filtering = await self.hass.async_add_executor_job(
+                _decode_export_lines, batch, zones, locations, cutoff_str
+            )
+            records.extend(kept)
+            for location, zone in batch_seen.items():
+                seen.setdefault(location, zone)
+            decode_time += decoding
+            filter_time += filtering
+
+        async for line in self.client.async_iter_lines(
+            "exports/jsonl", {"select": EXPORT_FIELDS}, verify_ssl=self._verify_ssl_all
+        ):
+            rows += 1
+            batch.append(line)
+            if len(batch) >= EXPORT_BATCH:
+                await _flush()
+                batch = []
+        if batch:
+            await _flush()
+
+        metrics.add("json_decode", decode_time)
+        metrics.add("filtering", filter_time)
+        metrics.records_received += rows
+        metrics.records_kept += len(records)
+        self._set_locations(seen.items())
+        _LOGGER.debug(f"Export : {len(records)} lignes conservées sur {rows}, {len(self.locations)} localisations")
+        records.sort(key=lambda r: r.get("start_date") or "")
+        return records
+
+    async def _async_ingest_records(
+        self, targets: frozenset[tuple[str, str]], cutoff: date
+    ) -> list[dict[str, Any]]:
+        """Page through the records API for the configured zones and locations."""
+        by_field: dict[str, list[str]] = {}
+        for field, value in sorted(targets):
+            by_field.setdefault(field, []).append(value)
+        filters = " OR ".join(
+            f"{field} IN ({', '.join(_quote(value) for value in values)})"
+            for field, values in by_field.items()
+        )
+        params: dict[str, Any] = {
+            # Toute l'année scolaire en cours et les suivantes déjà publiées
+            "where": f"end_date>=date'{cutoff.isoformat()}' AND ({filters})",
+            "order_by": "start_date ASC",
+            "limit": PAGE_SIZE,
+        }
+        verify_ssl = self._verify_ssl_all
+
+        records: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            data = await self.client.async_get_json(
+                "records", {**params, "offset": offset}, verify_ssl=verify_ssl
+            )
+            page = data.get("results") or []
+            records.extend(_intern_record(record) for record in page)
+            self.client.metrics.records_received += len(page)
+            offset += len(page)
+            if len(page) < PAGE_SIZE or offset >= data.get("total_count", 0):
+                break
+        self.client.metrics.records_kept += len(records)
+        return records
+
+    @property
+    def cache_hit_ratio(self) -> float | None:
+        """Return the share of refreshes served without downloading the records."""
+        hits = self.freshness_hits + self.validation_hits
+        total = hits + self.validation_misses
+        return hits / total if total else None
+
+    @callback
+    def covers(self, field: str, value: str) -> bool:
+        """Return True if the records in memory include this zone or location."""
+        return (field, value) in self._fetched_targets or (field, value) in self._available
+
+    @callback
+    def async_get_slice(self, field: str, value: str) -> list[dict[str, Any]]:
+        """Return the records of one zone or location."""
+        return [r for r in self.records if r.get(field) == value]
+
+
+def async_get_store(hass: HomeAssistant) -> VacancesScolairesCalendarStore:
+    """Return the store of this hass instance, creating it if needed."""
+    store = hass.data.get(DATA_STORE)
+    if store is None:
+        store = hass.data[DATA_STORE] = VacancesScolairesCalendarStore(hass, async_get_client(hass))
+    return store
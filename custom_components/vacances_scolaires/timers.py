@@ -0,0 +1,99 @@
+"""Boundary timers shared by every config entry."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import heapq
+from itertools import count
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+
+from .const import DATA_TIMERS
+
+
+class SharedTimers:
+    """Run scheduled callbacks from a single loop timer.
+
+    Les entrées d'un même fuseau basculent toutes à minuit local : un seul
+    minuteur armé sur l'échéance la plus proche remplace un minuteur par entrée.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._heap: list[tuple[datetime, int, Callable[[datetime], None]]] = []
+        self._pending: set[int] = set()
+        self._sequence = count()
+        self._armed_at: datetime | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    def __len__(self) -> int:
+        """Return the number of pending callbacks."""
+        return len(self._pending)
+
+    @callback
+    def async_schedule(self, when: datetime, action: Callable[[datetime], None]) -> CALLBACK_TYPE:
+        """Call action at the given moment; return a callback to cancel it."""
+        sequence = next(self._sequence)
+        heapq.heappush(self._heap, (when, sequence, action))
+        self._pending.add(sequence)
+        if self._armed_at is None or when < self._armed_at:
+            self._arm(when)
+
+        @callback
+        def _cancel() -> None:
+            # Retiré du tas à son échéance, sans réordonner maintenant
+            self._pending.discard(sequence)
+
+        return _cancel
+
+    def _arm(self, when: datetime) -> None:
+        if self._unsub is not None:
+            self._unsub()
+        self._armed_at = when
+        self._unsub = async_track_point_in_utc_time(self.hass, self._async_fire, when)
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Run every callback that is due, then arm the timer for the next one."""
+        self._unsub = self._armed_at = None
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, action = heapq.heappop(self._heap)
+            if sequence in self._pending:
+                self._pending.discard(sequence)
+                due.append(action)
+        for action in due:
+            action(now)
+        # Les callbacks ont pu replanifier : on réarme sur la plus proche échéance restante
+        while self._heap and self._heap[0][1] not in self._pending:
+            heapq.heappop(self._heap)
+        if self._heap and (self._armed_at is None or self._heap[0][0] < self._armed_at):
+            self._arm(self._heap[0][0])
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the loop timer."""
+        if self._unsub is not None:
+            self._unsub()
+        self._unsub = self._armed_at = None
+        self._heap.clear()
+        self._pending.clear()
+
+
+@callback
+def async_get_shared_timers(hass: HomeAssistant) -> SharedTimers:
+    """Return the shared timers of this hass instance, creating them if needed."""
+    timers = hass.data.get(DATA_TIMERS)
+    if timers is None:
+        timers = hass.data[DATA_TIMERS] = SharedTimers(hass)
+    return timers
+
+
+@callback
+def async_release_shared_timers(hass: HomeAssistant) -> None:
+    """Drop the shared timers once no entry uses them anymore."""
+    timers = hass.data.pop(DATA_TIMERS, None)
+    if timers is not None:
+        timers.async_shutdown()
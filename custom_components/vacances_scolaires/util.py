@@ -0,0 +1,39 @@
+"""Helpers shared by the Vacances Scolaires modules."""
+from __future__ import annotations
+
+from functools import lru_cache
+import re
+import unicodedata
+
+# Tirets, apostrophes, espaces… : « Aix-Marseille » et « aix marseille » se confondent
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def get_timezone(location: str) -> str:
+    timezone_mapping = {
+        "Guadeloupe": "America/Guadeloupe",
+        "Guyane": "America/Cayenne",
+        "Martinique": "America/Martinique",
+        "Mayotte": "Indian/Mayotte",
+        "Nouvelle Calédonie": "Pacific/Noumea",
+        "Polynésie française": "Pacific/Tahiti",
+        "Réunion": "Indian/Reunion",
+        "Saint Pierre et Miquelon": "America/Miquelon",
+        "Wallis et Futuna": "Pacific/Wallis"
+    }
+    return timezone_mapping.get(location, "Europe/Paris")
+
+
+@lru_cache(maxsize=512)
+def normalize_population(pop: str | None) -> str:
+    """Normalise le champ population (minuscules + sans accents)."""
+    if not pop:
+        return ""
+    pop_norm = unicodedata.normalize("NFD", pop).encode("ascii", "ignore").decode("utf-8")
+    return pop_norm.lower()
+
+
+@lru_cache(maxsize=512)
+def normalize_location(location: str | None) -> str:
+    """Normalise une localisation (minuscules, sans accents ni ponctuation)."""
+    return _SEPARATORS.sub(" ", normalize_population(location)).strip()
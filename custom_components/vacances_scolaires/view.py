@@ -0,0 +1,71 @@
+"""Per-entry view-model read by every entity of a config entry."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    ATTR_ANNEE_SCOLAIRE,
+    ATTR_DESCRIPTION,
+    ATTR_END_DATE,
+    ATTR_EN_VACANCES,
+    ATTR_LOCATION,
+    ATTR_START_DATE,
+    ATTR_ZONE,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import VacancesScolairesData
+
+ON_VACATION = "En vacances"
+NOT_ON_VACATION = "Pas en vacances"
+
+
+@dataclass(slots=True, frozen=True)
+class EntryView:
+    """States and attributes of an entry, built once per snapshot.
+
+    Les entités ne font que lire ces champs : une entité dérivée de plus ne
+    coûte rien à la mise à jour.
+    """
+
+    data: VacancesScolairesData
+    state: str
+    attributes: dict[str, Any]
+    today: str
+    tomorrow: str
+    # Par population : (état, attributs)
+    populations: dict[str, tuple[str, dict[str, Any]]]
+
+    @classmethod
+    def build(cls, data: VacancesScolairesData) -> EntryView:
+        """Derive every entity state from the snapshot."""
+        populations = {}
+        for population, (on_vacation, period) in data.population_states.items():
+            attributes: dict[str, Any] = {ATTR_EN_VACANCES: on_vacation}
+            if period is not None:
+                attributes = {
+                    ATTR_START_DATE: period.start.astimezone(data.timezone).isoformat(),
+                    ATTR_END_DATE: period.end.astimezone(data.timezone).isoformat(),
+                    ATTR_DESCRIPTION: period.description,
+                    ATTR_ANNEE_SCOLAIRE: period.annee_scolaire,
+                    ATTR_EN_VACANCES: on_vacation,
+                }
+            populations[population] = (ON_VACATION if on_vacation else NOT_ON_VACATION, attributes)
+
+        return cls(
+            data=data,
+            state=data.state,
+            attributes={
+                ATTR_START_DATE: data.start_date_display,
+                ATTR_END_DATE: data.end_date_display,
+                ATTR_DESCRIPTION: data.description,
+                ATTR_LOCATION: data.location,
+                ATTR_ZONE: data.zone,
+                ATTR_ANNEE_SCOLAIRE: data.annee_scolaire,
+                ATTR_EN_VACANCES: data.on_vacation,
+            },
+            today=ON_VACATION if data.on_vacation else NOT_ON_VACATION,
+            tomorrow=ON_VACATION if data.on_vacation_tomorrow else NOT_ON_VACATION,
+            populations=populations,
+        )
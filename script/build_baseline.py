@@ -0,0 +1,70 @@
+"""Build the calendar baseline bundled with a release.
+
+Usage : python script/build_baseline.py [--output custom_components/vacances_scolaires/baseline.json.gz]
+
+Télécharge l'export du jeu de données et n'en garde que les années scolaires
+publiées à partir de l'année en cours. Ne dépend que de la bibliothèque
+standard : lancé tel quel par le workflow de publication.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timezone
+import importlib.util
+import json
+from pathlib import Path
+import sys
+from types import ModuleType
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+COMPONENT = Path(__file__).resolve().parent.parent / "custom_components" / "vacances_scolaires"
+
+
+def _load(name: str) -> ModuleType:
+    """Load a standalone module of the integration without importing the package (and Home Assistant)."""
+    spec = importlib.util.spec_from_file_location(name, COMPONENT / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+const = _load("const")
+baseline = _load("baseline")
+
+
+def school_year_start(today: date) -> str:
+    """Return the first day of the school year containing the given day."""
+    return date(today.year if today.month >= 8 else today.year - 1, 8, 1).isoformat()
+
+
+def main(args: argparse.Namespace) -> None:
+    """Download the dataset and write the compressed baseline."""
+    with urlopen(f"{const.API_BASE_URL}?{urlencode({'select': 'metas'})}", timeout=60) as response:
+        metas = (json.load(response).get("metas") or {}).get("default") or {}
+    modified = metas.get("data_processed") or metas.get("modified")
+
+    cutoff = school_year_start(date.today())
+    query = urlencode({"select": ",".join(baseline.BASELINE_FIELDS)})
+    records = []
+    with urlopen(f"{const.API_BASE_URL}/exports/jsonl?{query}", timeout=300) as response:
+        for line in response:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if baseline.is_valid_record(record) and record["end_date"][:10] >= cutoff:
+                records.append(record)
+    if not records:
+        raise SystemExit("Aucun enregistrement exploitable : export vide ou schéma modifié")
+
+    built_at = datetime.now(timezone.utc).isoformat()
+    body = baseline.encode_baseline(records, built_at, modified)
+    args.output.write_bytes(body)
+    print(f"{args.output} : {len(records)} périodes, {len(body)} octets")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=COMPONENT / "baseline.json.gz")
+    main(parser.parse_args())
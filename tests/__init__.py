@@ -0,0 +1 @@
+"""Tests for the vacances_scolaires integration."""
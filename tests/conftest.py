@@ -0,0 +1,17 @@
+"""Fixtures for the vacances_scolaires tests."""
+import pytest
+
+from custom_components.vacances_scolaires import api
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load custom_components/ in every test."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def no_request_delays(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Send requests without the client's pacing and backoff delays."""
+    monkeypatch.setattr(api, "MIN_REQUEST_INTERVAL", 0)
+    monkeypatch.setattr(api, "RETRY_BASE_DELAY", 0)
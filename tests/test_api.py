@@ -0,0 +1,92 @@
+"""Tests for the HTTP client shared by every entry."""
+from http import HTTPStatus
+
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+from yarl import URL
+
+from custom_components.vacances_scolaires.api import (
+    BREAKER_THRESHOLD,
+    MAX_ATTEMPTS,
+    CircuitOpenError,
+    RetryableStatusError,
+    VacancesScolairesApiClient,
+)
+from custom_components.vacances_scolaires.const import API_BASE_URL
+
+RECORDS_URL = f"{API_BASE_URL}/records"
+
+
+def _sequence(*statuses: int):
+    """Return a mock side effect answering with the given statuses, in order."""
+    pending = list(statuses)
+
+    async def _respond(method: str, url: URL, data: object) -> AiohttpClientMockResponse:
+        status = pending.pop(0)
+        return AiohttpClientMockResponse(method, url, status=status, json={"total_count": 0, "results": []})
+
+    return _respond
+
+
+async def test_transient_errors_are_retried(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """5xx and 429 answers are retried until one succeeds."""
+    aioclient_mock.get(
+        RECORDS_URL,
+        side_effect=_sequence(HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.OK),
+    )
+    client = VacancesScolairesApiClient(hass)
+
+    assert await client.async_get_json("records", {}) == {"total_count": 0, "results": []}
+    assert aioclient_mock.call_count == 3
+    assert not client.circuit_open
+
+
+async def test_long_retry_after_is_not_waited_for(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """A Retry-After longer than the retry budget fails at once."""
+    aioclient_mock.get(RECORDS_URL, status=HTTPStatus.TOO_MANY_REQUESTS, headers={"Retry-After": "3600"})
+    client = VacancesScolairesApiClient(hass)
+
+    with pytest.raises(RetryableStatusError) as err:
+        await client.async_get_json("records", {})
+    assert err.value.retry_after == 3600
+    assert aioclient_mock.call_count == 1
+
+
+async def test_breaker_opens_after_repeated_failures(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """After BREAKER_THRESHOLD failed calls the client stops calling the API."""
+    aioclient_mock.get(RECORDS_URL, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+    client = VacancesScolairesApiClient(hass)
+
+    for _ in range(BREAKER_THRESHOLD):
+        with pytest.raises(RetryableStatusError):
+            await client.async_get_json("records", {})
+    assert aioclient_mock.call_count == BREAKER_THRESHOLD * MAX_ATTEMPTS
+    assert client.circuit_open
+
+    with pytest.raises(CircuitOpenError):
+        await client.async_get_json("records", {})
+    assert aioclient_mock.call_count == BREAKER_THRESHOLD * MAX_ATTEMPTS
+
+
+async def test_success_resets_failure_count(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """Only consecutive failures open the breaker."""
+    failed = [HTTPStatus.INTERNAL_SERVER_ERROR] * MAX_ATTEMPTS
+    aioclient_mock.get(
+        RECORDS_URL,
+        side_effect=_sequence(*failed, *failed, HTTPStatus.OK, *failed, *failed),
+    )
+    client = VacancesScolairesApiClient(hass)
+
+    for expected_success in (False, False, True, False, False):
+        if expected_success:
+            await client.async_get_json("records", {})
+            continue
+        with pytest.raises(RetryableStatusError):
+            await client.async_get_json("records", {})
+    assert not client.circuit_open
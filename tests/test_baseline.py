@@ -0,0 +1,61 @@
+"""Tests for merging downloads into the records in memory."""
+from custom_components.vacances_scolaires.baseline import merge_records
+
+
+def _record(location: str, year: str, description: str, start: str, end: str) -> dict:
+    return {
+        "description": description,
+        "population": "-",
+        "start_date": f"{start}T23:00:00+00:00",
+        "end_date": f"{end}T23:00:00+00:00",
+        "location": location,
+        "zones": "Zone C",
+        "annee_scolaire": year,
+    }
+
+
+PARIS_TOUSSAINT = _record("Paris", "2024-2025", "Vacances de la Toussaint", "2024-10-18", "2024-11-03")
+PARIS_NOEL = _record("Paris", "2024-2025", "Vacances de Noël", "2024-12-20", "2025-01-05")
+CRETEIL_NOEL = _record("Créteil", "2024-2025", "Vacances de Noël", "2024-12-20", "2025-01-05")
+PARIS_NEXT = _record("Paris", "2025-2026", "Vacances de la Toussaint", "2025-10-17", "2025-11-02")
+CUTOFF = "2024-09-01"
+
+
+def test_download_replaces_location_and_school_year() -> None:
+    """Rows of a downloaded (académie, school year) replace all the rows in memory."""
+    moved = _record("Paris", "2024-2025", "Vacances de Noël", "2024-12-21", "2025-01-06")
+    merged, changed = merge_records([PARIS_TOUSSAINT, PARIS_NOEL, CRETEIL_NOEL, PARIS_NEXT], [moved], CUTOFF)
+    assert changed
+    assert merged == [CRETEIL_NOEL, moved, PARIS_NEXT]
+
+
+def test_unchanged_download_returns_current_list() -> None:
+    """A download identical to memory keeps the current list itself."""
+    current = [PARIS_TOUSSAINT, PARIS_NOEL, CRETEIL_NOEL]
+    merged, changed = merge_records(current, [dict(PARIS_TOUSSAINT), dict(PARIS_NOEL)], CUTOFF)
+    assert not changed
+    assert merged is current
+
+
+def test_records_ended_before_cutoff_are_dropped() -> None:
+    """Records not downloaded again are kept only until the cutoff."""
+    merged, changed = merge_records([PARIS_TOUSSAINT, PARIS_NOEL, CRETEIL_NOEL], [], "2024-12-01")
+    assert changed
+    assert merged == [PARIS_NOEL, CRETEIL_NOEL]
+
+
+def test_invalid_download_keeps_memory() -> None:
+    """Rows missing a required field are ignored instead of wiping an académie."""
+    broken = {**PARIS_NOEL, "annee_scolaire": None}
+    current = [PARIS_TOUSSAINT, PARIS_NOEL]
+    merged, changed = merge_records(current, [broken], CUTOFF)
+    assert not changed
+    assert merged is current
+
+
+def test_merged_records_sorted_by_start() -> None:
+    """New rows are merged in start order."""
+    merged, changed = merge_records([PARIS_NOEL], [PARIS_NEXT, CRETEIL_NOEL], CUTOFF)
+    assert changed
+    assert [record["start_date"] for record in merged] == sorted(record["start_date"] for record in merged)
+    assert len(merged) == 3
@@ -0,0 +1,140 @@
+"""Tests for the per-entry coordinator."""
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from datetime import UTC, date, datetime
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.vacances_scolaires.api import VacancesScolairesApiClient
+from custom_components.vacances_scolaires.const import CONF_CONFIG_TYPE, CONF_LOCATION, DOMAIN
+from custom_components.vacances_scolaires.coordinator import VacancesScolairesDataUpdateCoordinator
+from custom_components.vacances_scolaires.store import VacancesScolairesCalendarStore
+from custom_components.vacances_scolaires.timers import async_get_shared_timers, async_release_shared_timers
+
+
+def _record(description: str, start: str, end: str) -> dict:
+    return {
+        "description": description,
+        "population": "-",
+        "start_date": start,
+        "end_date": end,
+        "location": "Paris",
+        "zones": "Zone C",
+        "annee_scolaire": "2024-2025",
+    }
+
+
+RECORDS = [
+    _record("Vacances de la Toussaint", "2024-10-18T22:00:00+00:00", "2024-11-03T23:00:00+00:00"),
+    _record("Vacances de Noël", "2024-12-20T23:00:00+00:00", "2025-01-05T23:00:00+00:00"),
+]
+
+
+CoordinatorFactory = Callable[[], Awaitable[VacancesScolairesDataUpdateCoordinator]]
+
+
+@pytest.fixture
+async def refreshed_coordinator(hass: HomeAssistant) -> AsyncGenerator[CoordinatorFactory]:
+    """Return a factory of coordinators for Paris, refreshed from records already in memory."""
+    created: list[VacancesScolairesDataUpdateCoordinator] = []
+
+    async def _create() -> VacancesScolairesDataUpdateCoordinator:
+        coordinator = await _async_refreshed_coordinator(hass)
+        created.append(coordinator)
+        return coordinator
+
+    yield _create
+    # Équivalent du déchargement de l'entrée : aucune bascule ne reste planifiée
+    for coordinator in created:
+        coordinator._cancel_boundary()
+    async_release_shared_timers(hass)
+
+
+async def _async_refreshed_coordinator(hass: HomeAssistant) -> VacancesScolairesDataUpdateCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Paris", data={CONF_CONFIG_TYPE: "location", CONF_LOCATION: "Paris"}
+    )
+    entry.add_to_hass(hass)
+    store = VacancesScolairesCalendarStore(hass, VacancesScolairesApiClient(hass))
+    # Calendrier déjà à jour : le rafraîchissement ne fait aucun appel réseau
+    store.records = RECORDS
+    store.fetched_at = dt_util.utcnow()
+    store._fetched_targets = frozenset({("location", "Paris")})
+    coordinator = VacancesScolairesDataUpdateCoordinator(hass, entry, store)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    return coordinator
+
+
+async def test_snapshot_during_vacation(
+    refreshed_coordinator: CoordinatorFactory, freezer: FrozenDateTimeFactory
+) -> None:
+    """The snapshot describes the current period in the zone's local time."""
+    freezer.move_to("2024-10-21T10:00:00+00:00")
+    coordinator = await refreshed_coordinator()
+    data = coordinator.data
+
+    assert data.state == "Zone C - Holidays"
+    assert data.on_vacation
+    assert data.on_vacation_tomorrow
+    assert data.description == "Vacances de la Toussaint"
+    assert data.start.date() == date(2024, 10, 19)
+    assert data.end.date() == date(2024, 11, 4)
+    assert data.start.tzinfo is data.timezone
+    assert len(data.periods) == 2
+
+
+async def test_snapshot_before_vacation(
+    refreshed_coordinator: CoordinatorFactory, freezer: FrozenDateTimeFactory
+) -> None:
+    """Outside the vacations the snapshot announces the next period."""
+    freezer.move_to("2024-10-18T10:00:00+00:00")
+    coordinator = await refreshed_coordinator()
+    data = coordinator.data
+
+    assert data.state == "Zone C - Work"
+    assert not data.on_vacation
+    # Veille des vacances : demain est un jour de vacances
+    assert data.on_vacation_tomorrow
+    assert data.description == "Vacances de la Toussaint"
+    assert data.start.date() == date(2024, 10, 19)
+
+
+async def test_published_snapshot_schedules_one_boundary(
+    hass: HomeAssistant, refreshed_coordinator: CoordinatorFactory, freezer: FrozenDateTimeFactory
+) -> None:
+    """Each published snapshot replaces the pending boundary of the entry."""
+    freezer.move_to("2024-10-21T10:00:00+00:00")
+    coordinator = await refreshed_coordinator()
+    timers = async_get_shared_timers(hass)
+    assert len(timers) == 1
+
+    coordinator.async_set_updated_data(coordinator.data)
+    assert len(timers) == 1
+    # En vacances : prochaine bascule à minuit local
+    assert coordinator._next_boundary(dt_util.utcnow()) == datetime(2024, 10, 21, 22, tzinfo=UTC)
+
+
+async def test_boundary_switches_state_without_api_call(
+    hass: HomeAssistant, refreshed_coordinator: CoordinatorFactory, freezer: FrozenDateTimeFactory
+) -> None:
+    """At local midnight of the first vacation day the snapshot switches on its own."""
+    freezer.move_to("2024-10-18T10:00:00+00:00")
+    coordinator = await refreshed_coordinator()
+    # Minuit à Paris, premier jour des vacances de la Toussaint
+    first_day = datetime(2024, 10, 18, 22, tzinfo=UTC)
+    assert coordinator._next_boundary(dt_util.utcnow()) == first_day
+    assert not coordinator.data.on_vacation
+
+    freezer.move_to(first_day)
+    async_fire_time_changed(hass)
+    # Instantané reconstruit dans l'exécuteur, depuis une tâche d'arrière-plan
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.data.on_vacation
+    assert coordinator.data.state == "Zone C - Holidays"
+    # Bascule suivante : minuit local du lendemain
+    assert coordinator._next_boundary(dt_util.utcnow()) == datetime(2024, 10, 19, 22, tzinfo=UTC)
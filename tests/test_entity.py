@@ -0,0 +1,70 @@
+"""Tests for the state writes of the entities."""
+from dataclasses import replace
+import json
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.vacances_scolaires.const import (
+    API_BASE_URL,
+    CONF_CONFIG_TYPE,
+    CONF_CREATE_CALENDAR,
+    CONF_LOCATION,
+    DOMAIN,
+)
+
+RECORD = {
+    "description": "Vacances de la Toussaint",
+    "population": "-",
+    "start_date": "2024-10-18T22:00:00+00:00",
+    "end_date": "2024-11-03T23:00:00+00:00",
+    "location": "Paris",
+    "zones": "Zone C",
+    "annee_scolaire": "2024-2025",
+}
+
+
+async def test_unchanged_update_writes_no_state(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, freezer: FrozenDateTimeFactory
+) -> None:
+    """Publishing the same snapshot again fires no state_changed event."""
+    freezer.move_to("2024-10-21T10:00:00+00:00")
+    aioclient_mock.get(f"{API_BASE_URL}/exports/jsonl", text=json.dumps(RECORD) + "\n")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Paris",
+        data={CONF_CONFIG_TYPE: "location", CONF_LOCATION: "Paris", CONF_CREATE_CALENDAR: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.data.on_vacation
+
+    entity_ids = {
+        entity.entity_id for entity in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    }
+    written: list[str] = []
+
+    @callback
+    def _count(event: Event) -> None:
+        if event.data["entity_id"] in entity_ids:
+            written.append(event.data["entity_id"])
+
+    unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+    coordinator.async_set_updated_data(coordinator.data)
+    await hass.async_block_till_done()
+    assert written == []
+
+    # Un changement réel est toujours écrit
+    coordinator.async_set_updated_data(replace(coordinator.data, state="Zone C - Work", on_vacation=False))
+    await hass.async_block_till_done()
+    assert written
+    unsubscribe()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
@@ -0,0 +1,95 @@
+"""Tests for the iCalendar feed."""
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from http import HTTPStatus
+from zoneinfo import ZoneInfo
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.vacances_scolaires.const import DOMAIN
+from custom_components.vacances_scolaires.ics import IcsFeed, async_register_ics_view, render_ics
+from custom_components.vacances_scolaires.index import VacationIndex, VacationPeriod
+
+PARIS = ZoneInfo("Europe/Paris")
+
+TOUSSAINT = VacationPeriod(
+    description="Vacances de la Toussaint",
+    start=datetime(2024, 10, 18, 22, tzinfo=UTC),
+    end=datetime(2024, 11, 3, 23, tzinfo=UTC),
+    zone="Zone C",
+    location="Paris",
+    annee_scolaire="2024-2025",
+    population="-",
+)
+
+
+@dataclass
+class _Coordinator:
+    """Just enough of the coordinator for the view."""
+
+    feed: IcsFeed
+    data: object = True
+
+    def async_get_ics_feed(self) -> IcsFeed:
+        return self.feed
+
+
+def _lines(body: bytes) -> list[str]:
+    # Lignes de continuation recollées (RFC 5545 §3.1)
+    return body.decode("utf-8").replace("\r\n ", "").split("\r\n")
+
+
+def test_render_all_day_events() -> None:
+    """Each period is an all-day event whose DTEND is the rentrée day."""
+    lines = _lines(render_ics("Paris", VacationIndex([TOUSSAINT], PARIS), PARIS))
+
+    assert lines[0] == "BEGIN:VCALENDAR"
+    assert "DTSTART;VALUE=DATE:20241019" in lines
+    assert "DTEND;VALUE=DATE:20241104" in lines
+    assert "SUMMARY:Vacances de la Toussaint" in lines
+    assert "DESCRIPTION:Zone C - 2024-2025" in lines
+    assert lines[-2:] == ["END:VCALENDAR", ""]
+
+
+def test_period_without_description() -> None:
+    """A record without a description renders an untitled event."""
+    untitled = replace(TOUSSAINT, description=None)
+    lines = _lines(render_ics("Paris", VacationIndex([untitled], PARIS), PARIS))
+
+    assert "SUMMARY:" in lines
+
+
+def test_long_lines_are_folded() -> None:
+    """Lines are folded at 75 octets without splitting a multi-byte character."""
+    name = "Académie de Besançon " * 6
+    body = render_ics(name, VacationIndex([], PARIS), PARIS)
+
+    for line in body.split(b"\r\n"):
+        assert len(line) <= 75
+        line.decode("utf-8")
+    assert f"X-WR-CALNAME:{name}" in _lines(body)
+
+
+async def test_feed_view(hass: HomeAssistant, hass_client_no_auth: ClientSessionGenerator) -> None:
+    """The view serves the feed, honours If-None-Match and rejects unknown entries."""
+    assert await async_setup_component(hass, "http", {})
+    feed = IcsFeed.build("Paris", VacationIndex([TOUSSAINT], PARIS), PARIS)
+    hass.data[DOMAIN] = {"entry": _Coordinator(feed)}
+    async_register_ics_view(hass)
+    client = await hass_client_no_auth()
+
+    response = await client.get(f"/api/{DOMAIN}/entry.ics", headers={"Accept-Encoding": "identity"})
+    assert response.status == HTTPStatus.OK
+    assert response.content_type == "text/calendar"
+    assert await response.read() == feed.body
+    etag = response.headers["ETag"]
+
+    response = await client.get(
+        f"/api/{DOMAIN}/entry.ics", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+    )
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    response = await client.get(f"/api/{DOMAIN}/unknown.ics")
+    assert response.status == HTTPStatus.NOT_FOUND
@@ -0,0 +1,79 @@
+"""Tests for the vacation interval index."""
+from datetime import UTC, date, datetime
+from zoneinfo import ZoneInfo
+
+from custom_components.vacances_scolaires.index import VacationIndex, VacationPeriod
+
+PARIS = ZoneInfo("Europe/Paris")
+
+
+def _period(description: str, start: str, end: str) -> VacationPeriod:
+    # Bornes publiées en UTC : minuit local du premier jour et du jour de reprise
+    return VacationPeriod(
+        description=description,
+        start=datetime.fromisoformat(start).astimezone(UTC),
+        end=datetime.fromisoformat(end).astimezone(UTC),
+        zone="Zone C",
+        location="Paris",
+        annee_scolaire="2024-2025",
+        population="-",
+    )
+
+
+TOUSSAINT = _period("Vacances de la Toussaint", "2024-10-18T22:00:00+00:00", "2024-11-03T23:00:00+00:00")
+NOEL = _period("Vacances de Noël", "2024-12-20T23:00:00+00:00", "2025-01-05T23:00:00+00:00")
+# Période courte incluse dans Noël : la fin cumulée doit éviter d'arrêter la recherche trop tôt
+PONT = _period("Pont", "2024-12-22T23:00:00+00:00", "2024-12-24T23:00:00+00:00")
+
+
+def _index() -> VacationIndex:
+    return VacationIndex([NOEL, TOUSSAINT, PONT], PARIS)
+
+
+def test_period_at_half_open_bounds() -> None:
+    """The first day is a vacation day, the rentrée day is not."""
+    index = _index()
+    assert index.period_at(date(2024, 10, 18)) is None
+    assert index.period_at(date(2024, 10, 19)) is TOUSSAINT
+    assert index.period_at(date(2024, 11, 3)) is TOUSSAINT
+    assert index.period_at(date(2024, 11, 4)) is None
+    assert index.is_vacation(date(2025, 1, 5))
+    assert not index.is_vacation(date(2025, 1, 6))
+
+
+def test_period_at_overlapping_periods() -> None:
+    """A day after a nested period still finds the enclosing one."""
+    index = _index()
+    assert index.period_at(date(2024, 12, 23)) is PONT
+    assert index.period_at(date(2024, 12, 26)) is NOEL
+
+
+def test_periods_at_matches_period_at() -> None:
+    """Batch lookups return one result per day, in the order given."""
+    index = _index()
+    days = [date(2024, 11, 4), date(2024, 10, 19), date(2024, 12, 26), date(2024, 12, 23), date(2024, 10, 18)]
+    assert index.periods_at(days) == [index.period_at(day) for day in days]
+    assert index.periods_at(days) == [None, TOUSSAINT, NOEL, PONT, None]
+
+
+def test_next_period_and_last_day() -> None:
+    """The index reports the next period, its first day and its exclusive last day."""
+    index = _index()
+    assert index.next_period(date(2024, 10, 1)) is TOUSSAINT
+    assert index.next_period(date(2024, 10, 19)) is NOEL
+    assert index.next_period(date(2025, 1, 1)) is None
+    assert index.first_day() == date(2024, 10, 19)
+    assert index.last_day() == date(2025, 1, 6)
+    assert VacationIndex([], PARIS).first_day() is None
+    assert VacationIndex([], PARIS).last_day() is None
+
+
+def test_between_inclusive_days_exclusive_rentree() -> None:
+    """between() includes both requested days but not the rentrée day."""
+    index = _index()
+    assert index.between(date(2024, 10, 1), date(2024, 10, 18)) == []
+    assert index.between(date(2024, 10, 1), date(2024, 10, 19)) == [TOUSSAINT]
+    assert index.between(date(2024, 11, 3), date(2024, 11, 3)) == [TOUSSAINT]
+    assert index.between(date(2024, 11, 4), date(2024, 12, 20)) == []
+    assert index.between(date(2024, 12, 26), date(2024, 12, 26)) == [NOEL]
+    assert index.between(date(2024, 10, 1), date(2025, 1, 31)) == [TOUSSAINT, NOEL, PONT]
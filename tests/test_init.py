@@ -0,0 +1,71 @@
+"""Tests for setting up and unloading config entries."""
+import json
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.vacances_scolaires.const import (
+    API_BASE_URL,
+    CONF_CONFIG_TYPE,
+    CONF_LOCATION,
+    DATA_CLIENT,
+    DATA_STORE,
+    DOMAIN,
+)
+
+RECORD = {
+    "description": "Vacances de la Toussaint",
+    "population": "-",
+    "start_date": "2024-10-18T22:00:00+00:00",
+    "end_date": "2024-11-03T23:00:00+00:00",
+    "location": "Paris",
+    "zones": "Zone C",
+    "annee_scolaire": "2024-2025",
+}
+
+
+@pytest.fixture
+async def loaded_entry(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, freezer: FrozenDateTimeFactory
+) -> MockConfigEntry:
+    """Return a Paris entry set up from a downloaded export."""
+    freezer.move_to("2024-10-21T10:00:00+00:00")
+    aioclient_mock.get(f"{API_BASE_URL}/exports/jsonl", text=json.dumps(RECORD) + "\n")
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Paris", data={CONF_CONFIG_TYPE: "location", CONF_LOCATION: "Paris"}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return entry
+
+
+async def test_last_unload_releases_shared_objects(hass: HomeAssistant, loaded_entry: MockConfigEntry) -> None:
+    """Unloading the last entry drops the shared store and client."""
+    store = hass.data[DATA_STORE]
+    assert await hass.config_entries.async_unload(loaded_entry.entry_id)
+    # Désinscrite avant le retour du déchargement
+    assert not store._targets
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert DATA_STORE not in hass.data
+    assert DATA_CLIENT not in hass.data
+
+
+async def test_reload_uses_live_shared_objects(hass: HomeAssistant, loaded_entry: MockConfigEntry) -> None:
+    """A reloaded entry never keeps a store or client released behind its back."""
+    assert await hass.config_entries.async_reload(loaded_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert loaded_entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][loaded_entry.entry_id]
+    assert hass.data[DATA_STORE] is coordinator.store
+    assert hass.data[DATA_CLIENT] is coordinator.store.client
+    assert loaded_entry.entry_id in coordinator.store._targets
+
+    assert await hass.config_entries.async_unload(loaded_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
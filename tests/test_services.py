@@ -0,0 +1,100 @@
+"""Tests for the query service."""
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+import pytest
+
+from custom_components.vacances_scolaires.api import VacancesScolairesApiClient
+from custom_components.vacances_scolaires.const import DATA_STORE, DOMAIN
+from custom_components.vacances_scolaires.services import SERVICE_QUERY, async_setup_services
+from custom_components.vacances_scolaires.store import VacancesScolairesCalendarStore
+
+
+def _record(description: str, start: str, end: str) -> dict:
+    return {
+        "description": description,
+        "population": "-",
+        "start_date": start,
+        "end_date": end,
+        "location": "Paris",
+        "zones": "Zone C",
+        "annee_scolaire": "2024-2025",
+    }
+
+
+RECORDS = [
+    _record("Vacances de la Toussaint", "2024-10-18T22:00:00+00:00", "2024-11-03T23:00:00+00:00"),
+    _record("Vacances de Noël", "2024-12-20T23:00:00+00:00", "2025-01-05T23:00:00+00:00"),
+]
+
+
+@pytest.fixture(autouse=True)
+def _zone_c_in_memory(hass: HomeAssistant) -> None:
+    """Load the Zone C calendar in the shared store and register the services."""
+    store = VacancesScolairesCalendarStore(hass, VacancesScolairesApiClient(hass))
+    store.records = RECORDS
+    store._fetched_targets = frozenset({("zones", "Zone C")})
+    store._set_locations([("Paris", "Zone C")])
+    hass.data[DATA_STORE] = store
+    async_setup_services(hass)
+
+
+async def _query(hass: HomeAssistant, **data) -> dict:
+    return await hass.services.async_call(DOMAIN, SERVICE_QUERY, data, blocking=True, return_response=True)
+
+
+async def test_query_matrix(hass: HomeAssistant) -> None:
+    """Each day is holidays, work, or unknown outside the published school years."""
+    response = await _query(
+        hass, dates=["2024-10-21", "2024-09-02", "2024-12-26", "2024-11-04", "2025-03-03"], zones="Zone C"
+    )
+
+    assert response["dates"] == ["2024-09-02", "2024-10-21", "2024-11-04", "2024-12-26", "2025-03-03"]
+    assert response["matrix"] == {
+        "Zone C": {
+            "2024-09-02": "work",
+            "2024-10-21": "holidays",
+            "2024-11-04": "work",
+            "2024-12-26": "holidays",
+            "2025-03-03": "unknown",
+        }
+    }
+    assert response["period_ids"] == {"Zone C": {"2024-10-21": 0, "2024-12-26": 1}}
+    assert [period["description"] for period in response["periods"]] == [
+        "Vacances de la Toussaint",
+        "Vacances de Noël",
+    ]
+
+
+async def test_query_range(hass: HomeAssistant) -> None:
+    """A date range includes both of its days."""
+    response = await _query(hass, start_date="2024-10-18", end_date="2024-10-20", zones="Zone C")
+
+    assert response["matrix"]["Zone C"] == {
+        "2024-10-18": "work",
+        "2024-10-19": "holidays",
+        "2024-10-20": "holidays",
+    }
+
+
+async def test_query_keyed_as_requested(hass: HomeAssistant) -> None:
+    """A location typed differently from the dataset keeps its own spelling in the response."""
+    response = await _query(hass, dates="2024-10-21", locations="paris")
+
+    assert response["matrix"] == {"paris": {"2024-10-21": "holidays"}}
+    assert response["period_ids"] == {"paris": {"2024-10-21": 0}}
+
+
+async def test_query_reuses_shared_indexes(hass: HomeAssistant) -> None:
+    """Indexes built for a query are kept in the shared store for the next ones."""
+    store = hass.data[DATA_STORE]
+    await _query(hass, dates="2024-10-21", zones="Zone C")
+    cached = store.index_cache[("zones", "Zone C", "Europe/Paris")]
+
+    await _query(hass, dates="2024-10-22", zones="Zone C")
+    assert store.index_cache[("zones", "Zone C", "Europe/Paris")] is cached
+
+
+async def test_query_zone_not_loaded(hass: HomeAssistant) -> None:
+    """Zones without data in memory are rejected rather than reported as work."""
+    with pytest.raises(ServiceValidationError):
+        await _query(hass, dates="2024-10-21", zones="Zone A")
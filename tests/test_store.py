@@ -0,0 +1,216 @@
+"""Tests for the calendar store shared by every entry."""
+import asyncio
+from datetime import date, timedelta
+import json
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+from yarl import URL
+
+from custom_components.vacances_scolaires.api import VacancesScolairesApiClient
+from custom_components.vacances_scolaires.const import (
+    ADAPTIVE_COVERED_MAX,
+    ADAPTIVE_COVERED_MIN,
+    ADAPTIVE_PENDING_MAX,
+    API_BASE_URL,
+)
+from custom_components.vacances_scolaires.store import VacancesScolairesCalendarStore, next_poll_interval
+
+EXPORT_URL = f"{API_BASE_URL}/exports/jsonl"
+RECORDS_URL = f"{API_BASE_URL}/records"
+METADATA_URL = API_BASE_URL
+
+
+def _record(location: str, zone: str, start: str, end: str) -> dict:
+    return {
+        "description": "Vacances de la Toussaint",
+        "population": "-",
+        "start_date": f"{start}T22:00:00+00:00",
+        "end_date": f"{end}T23:00:00+00:00",
+        "location": location,
+        "zones": zone,
+        "annee_scolaire": "2024-2025",
+    }
+
+
+PARIS = _record("Paris", "Zone C", "2024-10-18", "2024-11-03")
+LYON = _record("Lyon", "Zone A", "2024-10-18", "2024-11-03")
+MARSEILLE = _record("Aix-Marseille", "Zone B", "2024-10-18", "2024-11-03")
+# Année scolaire terminée : écartée même pour une zone suivie
+PARIS_LAST_YEAR = _record("Paris", "Zone C", "2023-10-20", "2023-11-05")
+
+
+@pytest.fixture(autouse=True)
+def _school_year_2024(freezer: FrozenDateTimeFactory) -> None:
+    """Run every test during the 2024-2025 school year."""
+    freezer.move_to("2024-10-01T08:00:00+00:00")
+
+
+def _export(*records: dict) -> str:
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+def _store(hass: HomeAssistant) -> VacancesScolairesCalendarStore:
+    return VacancesScolairesCalendarStore(hass, VacancesScolairesApiClient(hass))
+
+
+def _metadata(modified: str) -> dict:
+    return {"metas": {"default": {"modified": modified}}}
+
+
+def _downloads(aioclient_mock: AiohttpClientMocker) -> int:
+    """Return the number of record downloads, metadata requests excluded."""
+    return sum(1 for _, url, _, _ in aioclient_mock.mock_calls if url.path != URL(METADATA_URL).path)
+
+
+async def test_one_download_for_every_entry(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """One export covers every registered slice, and the other entries are notified."""
+    aioclient_mock.get(EXPORT_URL, text=_export(PARIS_LAST_YEAR, PARIS, LYON, MARSEILLE))
+    store = _store(hass)
+    notified = []
+    store.async_register("paris", "location", "Paris", True, lambda: notified.append("paris"))
+    store.async_register("zone_a", "zones", "Zone A", True, lambda: notified.append("zone_a"))
+
+    await store.async_fetch("paris", timedelta(hours=6))
+
+    assert aioclient_mock.call_count == 1
+    # L'entrée qui a demandé les données les publie elle-même
+    assert notified == ["zone_a"]
+    assert store.async_get_slice("location", "Paris") == [PARIS]
+    assert store.async_get_slice("zones", "Zone A") == [LYON]
+    assert MARSEILLE not in store.records
+
+
+async def test_records_api_when_export_unavailable(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Without the export, the records API is queried for the registered slices only."""
+    aioclient_mock.get(EXPORT_URL, status=404)
+    aioclient_mock.get(RECORDS_URL, json={"total_count": 2, "results": [PARIS, LYON]})
+    store = _store(hass)
+    store.async_register("paris", "location", "Paris", True, lambda: None)
+    store.async_register("zone_a", "zones", "Zone A", True, lambda: None)
+
+    await store.async_fetch("paris", timedelta(hours=6))
+
+    assert aioclient_mock.call_count == 2
+    where = aioclient_mock.mock_calls[1][1].query["where"]
+    assert where == "end_date>=date'2024-08-01' AND (location IN (\"Paris\") OR zones IN (\"Zone A\"))"
+    assert store.async_get_slice("zones", "Zone A") == [LYON]
+
+
+async def test_fresh_records_not_downloaded_again(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """A second entry within max_age reuses the records in memory."""
+    aioclient_mock.get(EXPORT_URL, text=_export(PARIS))
+    store = _store(hass)
+    store.async_register("paris", "location", "Paris", True, lambda: None)
+    store.async_register("paris_2", "location", "Paris", True, lambda: None)
+
+    await store.async_fetch("paris", timedelta(hours=6))
+    await store.async_fetch("paris_2", timedelta(hours=6))
+    assert aioclient_mock.call_count == 1
+
+
+async def test_concurrent_fetches_share_one_download(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Entries refreshing at the same time wait for a single download."""
+    aioclient_mock.get(EXPORT_URL, text=_export(PARIS, LYON))
+    store = _store(hass)
+    notified = []
+    store.async_register("paris", "location", "Paris", True, lambda: notified.append("paris"))
+    store.async_register("zone_a", "zones", "Zone A", True, lambda: notified.append("zone_a"))
+
+    results = await asyncio.gather(
+        store.async_fetch("paris", timedelta(hours=6)),
+        store.async_fetch("zone_a", timedelta(hours=6)),
+    )
+
+    assert results == [True, True]
+    assert aioclient_mock.call_count == 1
+    # Les deux entrées attendaient le téléchargement : aucune notification en double
+    assert notified == []
+    assert store.async_get_slice("zones", "Zone A") == [LYON]
+
+
+async def test_unchanged_dataset_not_downloaded_again(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Stale records are only downloaded again if the dataset metadata changed."""
+    aioclient_mock.get(METADATA_URL, json=_metadata("2024-09-01T10:00:00+00:00"))
+    aioclient_mock.get(EXPORT_URL, text=_export(PARIS))
+    store = _store(hass)
+    store.async_register("paris", "location", "Paris", True, lambda: None)
+
+    assert await store.async_fetch("paris", timedelta(hours=6))
+    # Date de modification encore inconnue : téléchargement, puis mémorisée
+    # (mêmes années scolaires qu'en mémoire : rien ne change)
+    assert not await store.async_fetch("paris", timedelta(0))
+    assert _downloads(aioclient_mock) == 2
+    assert store.dataset_modified == "2024-09-01T10:00:00+00:00"
+
+    assert not await store.async_fetch("paris", timedelta(0))
+    assert _downloads(aioclient_mock) == 2
+    assert store.validation_hits == 1
+
+
+async def test_not_modified_metadata_skips_download(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """The metadata request is conditional, and a 304 keeps the records in memory."""
+    aioclient_mock.get(METADATA_URL, json=_metadata("2024-09-01T10:00:00+00:00"), headers={"ETag": '"v1"'})
+    aioclient_mock.get(EXPORT_URL, text=_export(PARIS))
+    store = _store(hass)
+    store.async_register("paris", "location", "Paris", True, lambda: None)
+    await store.async_fetch("paris", timedelta(hours=6))
+    await store.async_fetch("paris", timedelta(0))
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(METADATA_URL, status=304)
+    assert not await store.async_fetch("paris", timedelta(0))
+
+    assert aioclient_mock.call_count == 1
+    assert aioclient_mock.mock_calls[0][3]["If-None-Match"] == '"v1"'
+    assert store.async_get_slice("location", "Paris") == [PARIS]
+
+
+TODAY = date(2024, 10, 18)
+# Année scolaire 2024-2025 : l'année suivante est publiée si les données dépassent le 1er août 2026
+COVERED = date(2026, 8, 31)
+PENDING = date(2026, 7, 4)
+BASE = timedelta(hours=6)
+
+
+def test_pending_year_backs_off_from_base() -> None:
+    """Until next school year is published, polling starts at the configured interval."""
+    assert next_poll_interval(PENDING, TODAY, 0, BASE) == BASE
+    assert next_poll_interval(PENDING, TODAY, 2, BASE) == BASE * 4
+    assert next_poll_interval(None, TODAY, 1, BASE) == BASE * 2
+
+
+def test_pending_year_capped() -> None:
+    """Unchanged polls never push a pending entry beyond its cap."""
+    cap = timedelta(hours=ADAPTIVE_PENDING_MAX)
+    assert next_poll_interval(PENDING, TODAY, 5, BASE) == cap
+    assert next_poll_interval(PENDING, TODAY, 1000, BASE) == cap
+
+
+def test_configured_interval_above_cap_is_kept() -> None:
+    """A configured interval longer than the cap is never shortened."""
+    base = timedelta(hours=ADAPTIVE_PENDING_MAX * 2)
+    assert next_poll_interval(PENDING, TODAY, 3, base) == base
+
+
+def test_covered_year_floor_and_cap() -> None:
+    """Once next school year is published, polling is slow and bounded."""
+    assert next_poll_interval(COVERED, TODAY, 0, BASE) == timedelta(hours=ADAPTIVE_COVERED_MIN)
+    assert next_poll_interval(COVERED, TODAY, 1, BASE) == timedelta(hours=ADAPTIVE_COVERED_MIN * 2)
+    assert next_poll_interval(COVERED, TODAY, 1000, BASE) == timedelta(hours=ADAPTIVE_COVERED_MAX)
+
+
+def test_new_school_year_resets_coverage() -> None:
+    """Coverage that sufficed last school year is pending again after August 1st."""
+    assert next_poll_interval(COVERED, date(2025, 7, 31), 0, BASE) == timedelta(hours=ADAPTIVE_COVERED_MIN)
+    assert next_poll_interval(COVERED, date(2025, 8, 1), 0, BASE) == BASE
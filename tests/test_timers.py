@@ -0,0 +1,88 @@
+"""Tests for the boundary timers shared by every entry."""
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.vacances_scolaires.timers import SharedTimers
+
+
+async def test_callbacks_run_in_order_once_due(hass: HomeAssistant) -> None:
+    """Each callback runs at its own deadline, from a single loop timer."""
+    timers = SharedTimers(hass)
+    now = dt_util.utcnow()
+    fired = []
+    timers.async_schedule(now + timedelta(minutes=2), lambda _: fired.append("second"))
+    timers.async_schedule(now + timedelta(minutes=1), lambda _: fired.append("first"))
+    assert len(timers) == 2
+
+    async_fire_time_changed(hass, now + timedelta(seconds=90))
+    await hass.async_block_till_done()
+    assert fired == ["first"]
+    assert len(timers) == 1
+
+    async_fire_time_changed(hass, now + timedelta(minutes=3))
+    await hass.async_block_till_done()
+    assert fired == ["first", "second"]
+    assert len(timers) == 0
+    timers.async_shutdown()
+
+
+async def test_cancelled_callback_never_runs(hass: HomeAssistant) -> None:
+    """A cancelled callback is skipped while the others still fire."""
+    timers = SharedTimers(hass)
+    now = dt_util.utcnow()
+    fired = []
+    cancel = timers.async_schedule(now + timedelta(minutes=1), lambda _: fired.append("cancelled"))
+    timers.async_schedule(now + timedelta(minutes=2), lambda _: fired.append("kept"))
+    cancel()
+    assert len(timers) == 1
+
+    # Échéance annulée : le minuteur se réarme sur la suivante sans rien exécuter
+    async_fire_time_changed(hass, now + timedelta(seconds=90))
+    await hass.async_block_till_done()
+    assert fired == []
+
+    async_fire_time_changed(hass, now + timedelta(minutes=3))
+    await hass.async_block_till_done()
+    assert fired == ["kept"]
+    timers.async_shutdown()
+
+
+async def test_callback_can_reschedule(hass: HomeAssistant) -> None:
+    """A callback scheduling its next deadline re-arms the shared timer."""
+    timers = SharedTimers(hass)
+    now = dt_util.utcnow()
+    fired = []
+
+    def _midnight(when) -> None:
+        fired.append(when)
+        if len(fired) == 1:
+            timers.async_schedule(now + timedelta(minutes=2), _midnight)
+
+    timers.async_schedule(now + timedelta(minutes=1), _midnight)
+    async_fire_time_changed(hass, now + timedelta(seconds=90))
+    await hass.async_block_till_done()
+    assert len(fired) == 1
+    assert len(timers) == 1
+
+    async_fire_time_changed(hass, now + timedelta(minutes=3))
+    await hass.async_block_till_done()
+    assert len(fired) == 2
+    assert len(timers) == 0
+    timers.async_shutdown()
+
+
+async def test_shutdown_drops_pending_callbacks(hass: HomeAssistant) -> None:
+    """Nothing fires after shutdown."""
+    timers = SharedTimers(hass)
+    now = dt_util.utcnow()
+    fired = []
+    timers.async_schedule(now + timedelta(minutes=1), fired.append)
+    timers.async_shutdown()
+    assert len(timers) == 0
+
+    async_fire_time_changed(hass, now + timedelta(minutes=2))
+    await hass.async_block_till_done()
+    assert fired == []